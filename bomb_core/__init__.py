@@ -0,0 +1,11 @@
+"""Hardware-independent game logic shared by the bomb defusal frontends."""
+from bomb_core.game import DEFAULT_PHASES, Game, GameState
+from bomb_core.puzzles import (
+    COUNTDOWN,
+    PENALTY_TIME,
+    PHASE_ORDER,
+    apply_penalty,
+    choose_wires_question,
+    generate_keypad,
+    generate_toggles,
+)
@@ -0,0 +1,198 @@
+"""
+Operator control channel: pause, adjust, skip and reset a running game.
+
+A small line-based server on loopback or a Unix socket takes one command per
+line and answers each with one line, "ok <status>" or "error <reason>":
+
+    pause                 stop the clock
+    resume                restart it
+    time +30 | time -30   add or take off seconds
+    skip                  count the phase being played as solved
+    reset                 end the game for a new one with the same seed
+    reseed [seed]         end the game for a new one with a new seed
+    player <name>         name who is playing, for the results
+    status                just report
+
+The server only parses and queues: Game.command() hands the command to the
+clock's thread, which applies it under the game lock before its next tick, so
+the phase threads keep sampling their inputs throughout.  A reset game stops
+and tells its subscribers; the launcher builds the new game and attaches it
+here.
+
+Enable with BOMB_ADMIN=<port> for 127.0.0.1:<port>, or BOMB_ADMIN=<path> for
+a Unix socket, and send commands with:
+
+    python -m bomb_core.admin --port 9471 pause
+    python -m bomb_core.admin --socket /run/bomb/admin.sock time -30
+"""
+import argparse
+import os
+import socket
+import socketserver
+import sys
+from threading import Thread
+
+DEFAULT_PORT = 9471
+APPLY_TIMEOUT = 2.0  # Seconds to wait for the clock to apply a command
+
+
+def status_line(game):
+    """One line about `game`: status, time left, phase, seed and player."""
+    timer = game.timer
+    solved = sum(phase._solved for phase in game.phases)
+    return (
+        f"{game.state.status}{' paused' if timer._paused else ''} "
+        f"{timer.face.text(timer._value)} solved {solved}/{len(game.phases)} "
+        f"seed {game.seed} player {game.player}"
+    )
+
+
+def parse(line):
+    """
+    Split a command line into a command name and its argument.
+
+    Returns:
+        tuple: (name, value); value is an int or None.
+
+    Raises:
+        ValueError: If the argument is not a whole number.
+    """
+    words = line.split()
+    if not words:
+        raise ValueError("empty command")
+    if len(words) > 2:
+        raise ValueError("too many arguments")
+    if len(words) == 1:
+        return words[0].lower(), None
+    try:
+        return words[0].lower(), int(words[1])
+    except ValueError:
+        raise ValueError(f"not a whole number: {words[1]}") from None
+
+
+class AdminServer(Thread):
+    def __init__(self, address, name="Admin"):
+        """
+        Takes operator commands for the attached game.
+
+        Args:
+            address (int or str): A TCP port on 127.0.0.1, or the path of a
+                Unix socket to create.
+            name (str): Thread name.
+        """
+        super().__init__(name=name, daemon=True)
+        self.game = None
+        self.commands = 0
+        admin = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    reply = admin.handle(line.decode(errors="replace"))
+                    self.wfile.write(reply.encode() + b"\n")
+
+        if isinstance(address, int):
+            self._server = _TCPServer(("127.0.0.1", address), Handler)
+        else:
+            if os.path.exists(address):
+                os.unlink(address)
+            self._server = _UnixServer(address, Handler)
+        self.address = address
+
+    def attach(self, game):
+        """Send commands to `game` from now on, such as the one after a reset."""
+        self.game = game
+
+    def handle(self, line):
+        """
+        Run one command line against the attached game.
+
+        Returns:
+            str: The reply, "ok <status>" or "error <reason>".
+        """
+        game = self.game
+        if game is None:
+            return "error no game"
+        try:
+            words = line.split(None, 1)
+            if words and words[0].lower() == "player":
+                # Not a game command: the name is only read when the game ends
+                player = words[1].strip()[:32] if len(words) > 1 else ""
+                if not player:
+                    raise ValueError("player needs a name")
+                game.player = player
+                return f"ok {status_line(game)}"
+            name, value = parse(line)
+            if name != "status":
+                done = game.command(name, value)
+                self.commands += 1
+                if not done.wait(APPLY_TIMEOUT):
+                    return "error clock not responding; command queued"
+                if name in ("reset", "reseed"):
+                    return "ok game ended; the station is starting a new one"
+        except ValueError as e:
+            return f"error {e}"
+        return f"ok {status_line(self.game)}"
+
+    def stop(self):
+        self._server.shutdown()
+
+    def run(self):
+        self._server.serve_forever(poll_interval=0.5)
+        self._server.server_close()
+
+
+# A thread per connection, so an operator who leaves one open does not
+# hold up anyone else's commands
+class _TCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def admin_from_environment(games):
+    """
+    Take operator commands for `games` if BOMB_ADMIN is set.
+
+    The variable's value is a TCP port on 127.0.0.1 or a Unix socket path.
+    The channel controls one game at a time, the last of `games`; attach its
+    replacement after a reset.
+
+    Returns:
+        AdminServer: The running server, or None when the channel is off.
+    """
+    address = os.environ.get("BOMB_ADMIN")
+    if not address:
+        return None
+    server = AdminServer(int(address) if address.isdigit() else address)
+    for game in games:
+        server.attach(game)
+    server.start()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Send a command to a bomb station")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--socket", help="Unix socket path, instead of the port")
+    parser.add_argument("command", nargs="+", help="e.g. pause, time -30, reseed 7")
+    args = parser.parse_args(argv)
+
+    if args.socket:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(args.socket)
+    else:
+        sock = socket.create_connection(("127.0.0.1", args.port))
+    with sock, sock.makefile("rwb") as stream:
+        stream.write(" ".join(args.command).encode() + b"\n")
+        stream.flush()
+        reply = stream.readline().decode().rstrip("\n")
+    print(reply)
+    return 0 if reply.startswith("ok") else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""
+Arena mode: many independent games in one process.
+
+A single Scheduler thread counts down every game's clock and polls each game's
+current phase in one pass, so running N stations costs one thread and one
+wakeup per tick rather than five threads per station.
+"""
+import threading
+from threading import Thread
+from time import monotonic, sleep, thread_time
+
+
+class Scheduler(Thread):
+    def __init__(self, interval=0.1, name="Scheduler"):
+        """
+        Drives every game added to it from one thread.
+
+        Args:
+            interval (float): Seconds between passes over the games.
+            name (str): Thread name.
+        """
+        super().__init__(name=name, daemon=True)
+        self.interval = interval
+        self._games = []
+        self._lock = threading.Lock()
+        self._running = True
+        self.passes = 0
+        self.cpu_time = 0.0
+
+    def add(self, game):
+        with self._lock:
+            self._games.append(game)
+
+    def remove(self, game):
+        with self._lock:
+            if game in self._games:
+                self._games.remove(game)
+
+    def games(self):
+        with self._lock:
+            return tuple(self._games)
+
+    def stop(self):
+        self._running = False
+
+    def run(self):
+        deadline = monotonic()
+        while self._running:
+            start = thread_time()
+            now = monotonic()
+            for game in self.games():
+                if game.state.status == "armed":
+                    game.step(now)
+                else:
+                    self.remove(game)
+            self.passes += 1
+            self.cpu_time += thread_time() - start
+
+            deadline += self.interval
+            delay = deadline - monotonic()
+            if delay < 0:
+                # Overran a whole pass; start afresh rather than bursting
+                deadline, delay = monotonic(), 0
+            sleep(delay)
+
+    def report(self):
+        """One-line summary of the scheduler's load."""
+        per_pass = self.cpu_time / self.passes * 1000 if self.passes else 0.0
+        return (
+            f"scheduler: {len(self.games())} games, {self.passes} passes, "
+            f"{per_pass:.3f} ms CPU per pass"
+        )
+
+
+class Arena:
+    def __init__(self, game_factory, stations, interval=0.1):
+        """
+        A set of stations sharing one scheduler.
+
+        Args:
+            game_factory (callable): Called with the station index, returns a
+                new, unstarted Game wired to that station's inputs.
+            stations (int): Number of stations.
+            interval (float): Seconds between scheduler passes.
+        """
+        self.scheduler = Scheduler(interval)
+        self.games = [game_factory(i) for i in range(stations)]
+
+    def start(self):
+        for game in self.games:
+            game.start(self.scheduler)
+        self.scheduler.start()
+
+    def stop(self):
+        self.scheduler.stop()
+        for game in self.games:
+            game.stop()
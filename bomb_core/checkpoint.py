@@ -0,0 +1,318 @@
+"""
+Crash-safe checkpoints of a running game.
+
+Everything needed to pick a game back up -- the clock, the phase being played,
+the puzzles and the progress made on them -- is packed into a fixed-layout
+record and stored in a small memory-mapped file on every change.  Storing into
+the map is a memory copy: the kernel writes the page back on its own, so a
+crashed or killed process loses nothing and the game threads never wait on
+fsync.  A background flush every few seconds bounds what a power cut can lose.
+
+The file holds two record slots written alternately, each with a sequence
+number and a CRC, so a record torn by a crash part way through a write is
+ignored in favour of the one before it.
+
+Record layout (little endian):
+
+    magic     4s    b"BOMB"
+    version   B
+    sequence  I     higher is newer
+    status    B     0 armed, 1 defused, 2 exploded, 3 reset
+    time      H     seconds left
+    countdown H     seconds the game started with
+    phase     B     current phase number
+    order     4B    phase codes in play order, 0 for unused
+    toggles   B     index into the config's toggle problems
+    operands  2B    keypad operands
+    entered   4s    keypad digits entered so far
+    question  B     index into the config's wires questions
+    cut       B     cut wire bitmask, wire A = bit 0
+    penalties 4B    wrong answers per phase, in play order
+    solves    4f    seconds each phase took, in play order; NaN if unsolved
+    operator  H     operator interventions so far
+    seeded    ?     whether seed is meaningful
+    seed      q
+    played    d     seconds played so far
+    on_phase  d     seconds spent on the current phase so far
+    player    32s
+    crc       I     CRC-32 of everything above
+"""
+import mmap
+import os
+from math import isnan, nan
+from time import monotonic, time
+import struct
+import threading
+import zlib
+from threading import Thread
+
+MAGIC = b"BOMB"
+VERSION = 2
+BODY = struct.Struct("<4sBIBHHB4BB2B4sBB4B4fH?qdd32s")
+CRC = struct.Struct("<I")
+SLOT_SIZE = BODY.size + CRC.size
+PHASE_CODES = ("Toggles", "Button", "Keypad", "Wires")  # Code is index + 1
+STATUSES = ("armed", "defused", "exploded", "reset")
+MAX_PHASES = 4
+
+
+def pack(game, seq):
+    """
+    Pack the resumable state of `game` into one record.
+
+    Returns:
+        bytes: The record, SLOT_SIZE bytes long.
+    """
+    names = [phase.name for phase in game.phases]
+    order = [PHASE_CODES.index(name) + 1 for name in names]
+    order += [0] * (MAX_PHASES - len(order))
+    penalties = [game.penalties.get(name, 0) for name in names]
+    penalties += [0] * (MAX_PHASES - len(penalties))
+    solves = [game.solve_times.get(name, nan) for name in names]
+    solves += [nan] * (MAX_PHASES - len(solves))
+    if game.started_at is None:
+        played, on_phase = game._played, game._phase_played
+    else:
+        played, on_phase = time() - game.started_at, monotonic() - game._phase_started
+
+    toggles = keypad = wires = None
+    for phase in game.phases:
+        if phase.name == "Toggles":
+            toggles = phase
+        elif phase.name == "Keypad":
+            keypad = phase
+        elif phase.name == "Wires":
+            wires = phase
+    problem = 0
+    if toggles is not None:
+        problems = [text for text, _ in game.config.toggle_problems]
+        problem = problems.index(toggles._math_problem)
+    operands, entered = (0, 0), b""
+    if keypad is not None:
+        operands = tuple(int(num, 2) for num in keypad._equation)
+        entered = keypad._value.encode()
+    question, cut = 0, 0
+    if wires is not None:
+        question = game.config.wires_questions.index(wires._current_question)
+        for letter in wires._cut_wires:
+            cut |= 1 << (ord(letter) - 65)
+
+    body = BODY.pack(
+        MAGIC,
+        VERSION,
+        seq & 0xFFFFFFFF,
+        STATUSES.index(game.state.status),
+        max(0, game.timer._value),
+        game.countdown,
+        game.state.current_phase,
+        *order,
+        problem,
+        *operands,
+        entered,
+        question,
+        cut,
+        *penalties,
+        *solves,
+        min(game.interventions, 0xFFFF),
+        game.seed is not None,
+        game.seed or 0,
+        played,
+        on_phase,
+        game.player.encode()[:32],
+    )
+    return body + CRC.pack(zlib.crc32(body))
+
+
+def unpack(record):
+    """
+    Unpack one record.
+
+    Returns:
+        dict: The saved state, or None if the record is blank or torn.
+    """
+    body = record[: BODY.size]
+    (crc,) = CRC.unpack_from(record, BODY.size)
+    if crc != zlib.crc32(body):
+        return None
+    fields = BODY.unpack(body)
+    if fields[0] != MAGIC or fields[1] != VERSION:
+        return None
+    (seq, status, time, countdown, phase) = fields[2:7]
+    order = fields[7:11]
+    problem, num1, num2, entered, question, cut = fields[11:17]
+    penalties = fields[17:21]
+    solves = fields[21:25]
+    interventions, seeded, seed, played, on_phase, player = fields[25:31]
+    names = tuple(PHASE_CODES[code - 1] for code in order if code)
+    return {
+        "seq": seq,
+        "status": STATUSES[status],
+        "time": time,
+        "countdown": countdown,
+        "phase": phase,
+        "phases": names,
+        "toggles": problem,
+        "keypad": (num1, num2),
+        "entered": entered.rstrip(b"\0").decode(),
+        "wires": question,
+        "cut": cut,
+        "penalties": dict(zip(names, penalties)),
+        "solve_times": {
+            name: solve for name, solve in zip(names, solves) if not isnan(solve)
+        },
+        "interventions": interventions,
+        "seed": seed if seeded else None,
+        "played": played,
+        "on_phase": on_phase,
+        "player": player.rstrip(b"\0").decode(errors="replace"),
+    }
+
+
+def load(path):
+    """
+    Read the newest intact record from a checkpoint file.
+
+    Returns:
+        dict: The saved state (see unpack), or None if there is none.
+    """
+    try:
+        with open(path, "rb") as f:
+            data = f.read(2 * SLOT_SIZE)
+    except FileNotFoundError:
+        return None
+    records = [
+        unpack(data[i : i + SLOT_SIZE])
+        for i in range(0, len(data) - SLOT_SIZE + 1, SLOT_SIZE)
+    ]
+    records = [record for record in records if record is not None]
+    return max(records, key=lambda record: record["seq"], default=None)
+
+
+def restore(game, saved):
+    """
+    Put a freshly built, unstarted game back into a saved state.
+
+    The game must have been built with the same phase order and question
+    bank as the one saved.  The clock resumes from the last tick saved, so at
+    most one second is lost, and the time the station was down does not
+    count towards the game's duration or the current phase's solve time.
+
+    Args:
+        game (Game): The game to restore.
+        saved (dict): A record from load().
+
+    Raises:
+        ValueError: If the saved game does not fit `game`.
+    """
+    names = tuple(phase.name for phase in game.phases)
+    if names != saved["phases"]:
+        raise ValueError(f"checkpoint is for phases {saved['phases']}, not {names}")
+    if game.parallel:
+        # The record counts the modules solved, not which ones
+        raise ValueError("parallel games cannot be resumed")
+    if saved["toggles"] >= len(game.config.toggle_problems) or saved["wires"] >= len(
+        game.config.wires_questions
+    ):
+        raise ValueError("checkpoint is for a different question bank")
+    game.seed = saved["seed"]
+    game.player = saved["player"]
+    game.countdown = saved["countdown"]
+    game._played = saved["played"]
+    game._phase_played = saved["on_phase"]
+    game.penalties = {name: n for name, n in saved["penalties"].items() if n}
+    game.solve_times = dict(saved["solve_times"])
+    game.interventions = saved["interventions"]
+    game.timer._value = saved["time"]
+    game.state.current_phase = saved["phase"]
+
+    for number, phase in enumerate(game.phases, 1):
+        if number < saved["phase"]:
+            phase._solved = True
+            phase._running = False
+        if phase.name == "Toggles":
+            problem, answer = game.config.toggle_problems[saved["toggles"]]
+            phase._solution, phase._math_problem = format(answer, "04b"), problem
+        elif phase.name == "Keypad":
+            num1, num2 = saved["keypad"]
+            phase._equation = (bin(num1)[2:], bin(num2)[2:])
+            phase._solution = num1 * num2
+            phase._value = saved["entered"]
+        elif phase.name == "Wires":
+            phase._current_question = game.config.wires_questions[saved["wires"]]
+            phase._cut_wires = {
+                chr(65 + i) for i in range(8) if saved["cut"] & (1 << i)
+            }
+
+
+class Checkpoint(Thread):
+    def __init__(self, path, flush_interval=5.0, name="Checkpoint"):
+        """
+        Keeps a game's state in a memory-mapped checkpoint file.
+
+        Args:
+            path (str): Checkpoint file, created if missing.
+            flush_interval (float): Seconds between background flushes to disk.
+            name (str): Thread name.
+        """
+        super().__init__(name=name, daemon=True)
+        self.path = path
+        self._flush_interval = flush_interval
+        saved = load(path)
+        self._seq = saved["seq"] + 1 if saved else 0
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if os.fstat(fd).st_size < 2 * SLOT_SIZE:
+                os.ftruncate(fd, 2 * SLOT_SIZE)
+            self._map = mmap.mmap(fd, 2 * SLOT_SIZE)
+        finally:
+            os.close(fd)
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self.saves = 0
+
+    def attach(self, game):
+        """Save `game` now and on every change from here on."""
+        self.save(game)
+        game.subscribe(lambda event, **data: self.save(game))
+
+    def save(self, game):
+        """Store the state of `game` in the next slot; never touches the disk."""
+        with self._lock:
+            offset = (self._seq % 2) * SLOT_SIZE
+            self._map[offset : offset + SLOT_SIZE] = pack(game, self._seq)
+            self._seq += 1
+            self.saves += 1
+
+    def stop(self):
+        self._stopped.set()
+
+    def run(self):
+        while not self._stopped.wait(self._flush_interval):
+            self._map.flush()
+        self._map.flush()
+
+
+def checkpoint_from_environment(game):
+    """
+    Resume and checkpoint `game` if BOMB_CHECKPOINT is set.
+
+    Call before the game starts and before any frontend looks at it: if the
+    file holds an armed game with the same phases, `game` picks up where that
+    one left off.
+
+    Returns:
+        Checkpoint: The running checkpoint, or None when checkpointing is off.
+    """
+    path = os.environ.get("BOMB_CHECKPOINT")
+    if not path:
+        return None
+    saved = load(path)
+    if saved is not None and saved["status"] == "armed":
+        try:
+            restore(game, saved)
+        except ValueError as e:
+            print(f"Not resuming from {path}: {e}")
+    checkpoint = Checkpoint(path)
+    checkpoint.attach(game)
+    checkpoint.start()
+    return checkpoint
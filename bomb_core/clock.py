@@ -0,0 +1,91 @@
+"""
+Precomputed readings of the countdown clock.
+
+Every value the clock can show, from 0 to the countdown, is formatted once as
+"mm:ss" text and as the four digit bitmasks the HT16K33 7-segment backpack
+takes.  Showing or reading the time is then an index into a tuple by the
+seconds left: the timer writes the bitmasks straight to the display, and the
+GUI and spectator feed read the text, with no formatting or allocation per
+tick and no lock -- the seconds left are a single int, read atomically.
+"""
+import threading
+
+# Segment bitmasks for 0-9, bit 0 = segment A, as adafruit_ht16k33 uses
+DIGIT_SEGMENTS = (0x3F, 0x06, 0x5B, 0x4F, 0x66, 0x6D, 0x7D, 0x07, 0x7F, 0x6F)
+
+
+def format_time(seconds):
+    """'mm:ss' for a number of seconds, never negative."""
+    seconds = max(0, seconds)
+    return f"{seconds // 60:02}:{seconds % 60:02}"
+
+
+def encode_segments(seconds):
+    """
+    The four digit bitmasks showing `seconds` as mm:ss.
+
+    Returns:
+        bytes: One bitmask per digit, or None past 99:59, which four digits
+        cannot show.
+    """
+    minutes, seconds = divmod(max(0, seconds), 60)
+    if minutes > 99:
+        return None
+    return bytes(
+        DIGIT_SEGMENTS[digit]
+        for digit in (minutes // 10, minutes % 10, seconds // 10, seconds % 10)
+    )
+
+
+class ClockFace:
+    def __init__(self, countdown):
+        """
+        Every reading of a clock counting down from `countdown`.
+
+        Args:
+            countdown (int): Most seconds the clock shows; readings above it
+                are formatted when asked for.
+        """
+        self.countdown = countdown
+        self.texts = tuple(format_time(s) for s in range(countdown + 1))
+        self.segments = tuple(encode_segments(s) for s in range(countdown + 1))
+
+    def text(self, seconds):
+        """The 'mm:ss' reading for `seconds` left."""
+        if 0 <= seconds <= self.countdown:
+            return self.texts[seconds]
+        return format_time(seconds)
+
+    def show(self, display, seconds):
+        """
+        Put `seconds` on a 7-segment display.
+
+        A Seg7x4 gets the precomputed bitmasks in one buffer update and one
+        I2C write; anything else, such as the mock display, gets the text.
+        """
+        segments = self.segments[seconds] if 0 <= seconds <= self.countdown else None
+        if segments is None or not hasattr(display, "set_digit_raw"):
+            display.print(self.text(seconds))
+            return
+        auto_write = display.auto_write
+        display.auto_write = False
+        for i, bits in enumerate(segments):
+            display.set_digit_raw(i, bits)
+        display.colon = True
+        display.auto_write = auto_write
+        display.show()
+
+
+_faces = {}
+_faces_lock = threading.Lock()
+
+
+def clock_face(countdown):
+    """The shared ClockFace for `countdown`, built on first use."""
+    face = _faces.get(countdown)
+    if face is None:
+        with _faces_lock:
+            face = _faces.get(countdown)
+            if face is None:
+                face = _faces[countdown] = ClockFace(countdown)
+    return face
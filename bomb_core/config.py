@@ -0,0 +1,389 @@
+"""
+Station configuration: pins, timings, question bank and difficulty.
+
+A config file is JSON; any key left out keeps its default, so a file only
+needs what differs from a stock station.  Files are validated and compiled
+once into a Config of plain tuples, with every keypad puzzle the difficulty
+allows worked out up front, so building a game from it costs nothing.
+ConfigFile rereads its file when it changes, and only between games: a game
+keeps the Config it was built with.
+
+Usage:
+    python -m bomb_core.config --dump > station.json
+    python -m bomb_core.config station.json
+"""
+import argparse
+import json
+import os
+import re
+import sys
+from time import perf_counter
+
+from bomb_core.puzzles import (
+    COUNTDOWN,
+    PENALTY_TIME,
+    TOGGLE_PROBLEMS,
+    WIRES_QUESTIONS,
+    keypad_table,
+)
+
+DEFAULTS = {
+    "countdown": COUNTDOWN,
+    "penalty": PENALTY_TIME,
+    "wire_debounce": 0.1,
+    "toggle_settle": 0.3,
+    "attempt_events": False,
+    "parallel": False,
+    "pins": {
+        "toggles": ["D12", "D16", "D20", "D21"],
+        "button": "D4",
+        "button_rgb": ["D17", "D27", "D22"],
+        "keypad_rows": ["D5", "D6", "D13", "D19"],
+        "keypad_cols": ["D10", "D9", "D11"],
+        "wires": ["D14", "D15", "D18", "D23", "D24"],
+    },
+    "keypad_keys": [[1, 2, 3], [4, 5, 6], [7, 8, 9], ["*", 0, "#"]],
+    "difficulty": {"max_operand": 255, "min_product": 1000, "max_product": 9999},
+    "toggle_problems": [list(problem) for problem in TOGGLE_PROBLEMS],
+    "wires_questions": [dict(question) for question in WIRES_QUESTIONS],
+}
+PIN_NAME = re.compile(r"D\d+$")
+KEYPAD_KEYS = set(range(10)) | {"*", "#"}
+
+
+class Config:
+    def __init__(
+        self,
+        countdown,
+        penalty,
+        pins,
+        keypad_keys,
+        toggle_problems,
+        keypad_table,
+        wires_questions,
+        wire_debounce,
+        toggle_settle,
+        attempt_events,
+        parallel=False,
+        source=None,
+    ):
+        """
+        A validated, compiled station configuration.  Build with compile_config.
+
+        Args:
+            countdown (int): Seconds on the clock.
+            penalty (int): Seconds a wrong answer costs.
+            pins (dict): Board pin names: a tuple per input group, a single
+                name for "button".
+            keypad_keys (tuple): Keypad legends, one tuple per row.
+            toggle_problems (tuple): (problem text, answer) pairs.
+            keypad_table (tuple): Every keypad puzzle allowed, as a keypad_table.
+            wires_questions (tuple): Question dicts, as in WIRES_QUESTIONS.
+            wire_debounce (float): Seconds a wire must read cut before it counts.
+            toggle_settle (float): Seconds the toggles must hold still before
+                their state is checked against the solution.
+            attempt_events (bool): Emit an "attempt" event for every settled
+                toggle state, for analytics.
+            parallel (bool): Arm every module at once instead of one after
+                another, for team play.
+            source (str): File the config came from, if any.
+        """
+        self.countdown = countdown
+        self.penalty = penalty
+        self.pins = pins
+        self.keypad_keys = keypad_keys
+        self.toggle_problems = toggle_problems
+        self.keypad_table = keypad_table
+        self.wires_questions = wires_questions
+        self.wire_debounce = wire_debounce
+        self.toggle_settle = toggle_settle
+        self.attempt_events = attempt_events
+        self.parallel = parallel
+        self.source = source
+
+    def board_pins(self, board):
+        """
+        Look the configured pins up on a board module.
+
+        Returns:
+            dict: Pin objects, keyed like `pins`.
+        """
+        try:
+            return {
+                group: getattr(board, names)
+                if isinstance(names, str)
+                else tuple(getattr(board, name) for name in names)
+                for group, names in self.pins.items()
+            }
+        except AttributeError as e:
+            raise ValueError(f"{self.source or 'config'}: no such board pin: {e}")
+
+
+def _fail(message):
+    raise ValueError(message)
+
+
+def _int(data, key, low, high):
+    value = data[key]
+    if not isinstance(value, int) or isinstance(value, bool) or not low <= value <= high:
+        _fail(f"{key} must be an integer from {low} to {high}, not {value!r}")
+    return value
+
+
+def _seconds(data, key, high):
+    value = data[key]
+    number = isinstance(value, (int, float)) and not isinstance(value, bool)
+    if not number or not 0 <= value <= high:
+        _fail(f"{key} must be a number of seconds from 0 to {high}, not {value!r}")
+    return float(value)
+
+
+def _pin_names(pins, group, count=None):
+    names = pins[group]
+    if isinstance(names, str) or not isinstance(names, list):
+        _fail(f"pins.{group} must be a list of pin names")
+    if count is not None and len(names) != count:
+        _fail(f"pins.{group} needs {count} pins, not {len(names)}")
+    for name in names:
+        if not isinstance(name, str) or not PIN_NAME.match(name):
+            _fail(f"pins.{group}: {name!r} is not a pin name like 'D12'")
+    return tuple(names)
+
+
+def compile_config(data, source=None):
+    """
+    Validate a config mapping and compile it.
+
+    Args:
+        data (dict): Parsed config; missing keys take their DEFAULTS.
+        source (str): Where `data` came from, for error messages.
+
+    Returns:
+        Config: The compiled config.
+
+    Raises:
+        ValueError: If anything in `data` is missing, misspelled or invalid.
+    """
+    try:
+        return _compile(data, source)
+    except ValueError as e:
+        raise ValueError(f"{source or 'config'}: {e}") from None
+
+
+def _compile(data, source):
+    if not isinstance(data, dict):
+        _fail("must be a JSON object")
+    unknown = set(data) - set(DEFAULTS)
+    if unknown:
+        _fail(f"unknown keys {sorted(unknown)}")
+    merged = dict(DEFAULTS, **data)
+    for section in ("pins", "difficulty"):
+        if not isinstance(merged[section], dict):
+            _fail(f"{section} must be a JSON object")
+        unknown = set(merged[section]) - set(DEFAULTS[section])
+        if unknown:
+            _fail(f"unknown {section} keys {sorted(unknown)}")
+        merged[section] = dict(DEFAULTS[section], **merged[section])
+
+    countdown = _int(merged, "countdown", 1, 65535)
+    penalty = _int(merged, "penalty", 0, countdown)
+    wire_debounce = _seconds(merged, "wire_debounce", 2)
+    toggle_settle = _seconds(merged, "toggle_settle", 5)
+    for key in ("attempt_events", "parallel"):
+        if not isinstance(merged[key], bool):
+            _fail(f"{key} must be true or false")
+
+    keys = merged["keypad_keys"]
+    if not isinstance(keys, list) or not keys:
+        _fail("keypad_keys must be a list of non-empty rows")
+    if not all(isinstance(row, list) and row for row in keys):
+        _fail("keypad_keys must be a list of non-empty rows")
+    if len({len(row) for row in keys}) != 1:
+        _fail("keypad_keys rows must all be the same length")
+    legends = [key for row in keys for key in row]
+    if not all(isinstance(key, (str, int)) and not isinstance(key, bool) for key in legends):
+        _fail("keypad_keys legends must be digits or the strings '*' and '#'")
+    if not set(legends) <= KEYPAD_KEYS or len(set(legends)) != len(legends):
+        _fail("keypad_keys must be distinct digits 0-9, '*' and '#'")
+    keypad_keys = tuple(tuple(row) for row in keys)
+
+    pins = merged["pins"]
+    button = pins["button"]
+    if not isinstance(button, str) or not PIN_NAME.match(button):
+        _fail(f"pins.button: {button!r} is not a pin name like 'D12'")
+    compiled_pins = {
+        "toggles": _pin_names(pins, "toggles", 4),
+        "button": button,
+        "button_rgb": _pin_names(pins, "button_rgb", 3),
+        "keypad_rows": _pin_names(pins, "keypad_rows", len(keypad_keys)),
+        "keypad_cols": _pin_names(pins, "keypad_cols", len(keypad_keys[0])),
+        "wires": _pin_names(pins, "wires"),
+    }
+    if not 1 <= len(compiled_pins["wires"]) <= 8:
+        _fail("pins.wires needs 1 to 8 pins")
+    used = [button] + [
+        name for names in compiled_pins.values() if not isinstance(names, str)
+        for name in names
+    ]
+    duplicates = sorted({name for name in used if used.count(name) > 1})
+    if duplicates:
+        _fail(f"pins used twice: {duplicates}")
+
+    if not isinstance(merged["toggle_problems"], list):
+        _fail("toggle_problems must be a list of [text, answer] pairs")
+    problems = []
+    for problem in merged["toggle_problems"]:
+        if (
+            not isinstance(problem, list)
+            or len(problem) != 2
+            or not isinstance(problem[0], str)
+            or not isinstance(problem[1], int)
+            or isinstance(problem[1], bool)
+            or not 0 <= problem[1] <= 15
+        ):
+            _fail(f"toggle_problems: {problem!r} is not [text, answer from 0 to 15]")
+        problems.append(tuple(problem))
+    if not problems:
+        _fail("toggle_problems must not be empty")
+
+    difficulty = merged["difficulty"]
+    max_operand = _int(difficulty, "max_operand", 1, 255)
+    min_product = _int(difficulty, "min_product", 0, 9999)
+    max_product = _int(difficulty, "max_product", min_product, 9999)
+    table = keypad_table(max_operand, min_product, max_product)
+    if not table:
+        _fail("difficulty allows no keypad puzzles")
+
+    wires = len(compiled_pins["wires"])
+    if not isinstance(merged["wires_questions"], list):
+        _fail("wires_questions must be a list of questions")
+    questions = []
+    for question in merged["wires_questions"]:
+        if not isinstance(question, dict) or set(question) != {
+            "question",
+            "choices",
+            "correct",
+        }:
+            _fail("wires_questions entries need question, choices and correct")
+        if not isinstance(question["question"], str):
+            _fail(f"wires question {question['question']!r} must be text")
+        choices = question["choices"]
+        if not isinstance(choices, list) or not all(isinstance(c, str) for c in choices):
+            _fail(f"wires question {question['question']!r}: choices must be a list of text")
+        if len(choices) != wires:
+            _fail(f"wires question {question['question']!r} needs {wires} choices")
+        if question["correct"] not in [chr(65 + i) for i in range(wires)]:
+            _fail(f"wires question {question['question']!r}: bad correct letter")
+        questions.append(dict(question, choices=list(question["choices"])))
+    if not questions:
+        _fail("wires_questions must not be empty")
+
+    return Config(
+        countdown,
+        penalty,
+        compiled_pins,
+        keypad_keys,
+        tuple(problems),
+        table,
+        tuple(questions),
+        wire_debounce,
+        toggle_settle,
+        merged["attempt_events"],
+        merged["parallel"],
+        source,
+    )
+
+
+def load_config(path):
+    """
+    Read, validate and compile a config file.
+
+    Raises:
+        ValueError: If the file is not valid JSON or not a valid config.
+    """
+    with open(path) as f:
+        try:
+            data = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"{path}: {e}") from None
+    return compile_config(data, path)
+
+
+DEFAULT_CONFIG = compile_config({})
+
+
+class ConfigFile:
+    def __init__(self, path):
+        """
+        A config file that is reloaded when it changes.
+
+        Args:
+            path (str): The config file.  It must be valid when first loaded.
+        """
+        self.path = path
+        self._stamp = self._stat()
+        self._config = load_config(path)
+        self.error = None  # Why the last reload was rejected, if it was
+        self.reloads = 0
+
+    def _stat(self):
+        stat = os.stat(self.path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def current(self):
+        """
+        The config to build the next game with.
+
+        Rereads the file if it changed since the last call.  An invalid file
+        is reported in `error` and the last good config kept.
+        """
+        try:
+            stamp = self._stat()
+            if stamp != self._stamp:
+                self._stamp = stamp
+                self._config = load_config(self.path)
+                self.error = None
+                self.reloads += 1
+        except (OSError, ValueError) as e:
+            self.error = str(e)
+            print(f"Config not reloaded: {e}", file=sys.stderr)
+        return self._config
+
+
+def config_from_environment():
+    """
+    The station's config file if BOMB_CONFIG is set.
+
+    Returns:
+        ConfigFile: The watched file, or None to use DEFAULT_CONFIG.
+    """
+    path = os.environ.get("BOMB_CONFIG")
+    return ConfigFile(path) if path else None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check a bomb station config")
+    parser.add_argument("path", nargs="?", help="config file to validate")
+    parser.add_argument("--dump", action="store_true", help="print the defaults")
+    args = parser.parse_args(argv)
+
+    if args.dump or not args.path:
+        json.dump(DEFAULTS, sys.stdout, indent=4)
+        print()
+        return
+    start = perf_counter()
+    try:
+        config = load_config(args.path)
+    except (OSError, ValueError) as e:
+        sys.exit(str(e))
+    elapsed = (perf_counter() - start) * 1000
+    print(
+        f"{args.path}: ok, {config.countdown}s countdown, {config.penalty}s penalty, "
+        f"{len(config.toggle_problems)} toggle problems, "
+        f"{config.keypad_table[-1][0]} keypad puzzles, "
+        f"{len(config.wires_questions)} wires questions ({elapsed:.1f} ms)"
+    )
+
+
+if __name__ == "__main__":
+    main()
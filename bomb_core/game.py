@@ -0,0 +1,387 @@
+"""
+The game core: one timer, one set of phase threads, and the state they share.
+
+Frontends subscribe to a Game and are told what happened; they never poll
+inputs or run timers of their own.
+"""
+import random
+import threading
+from collections import deque
+from time import monotonic, time
+
+from bomb_core.phases import Button, Keypad, Timer, Toggles, Wires
+from bomb_core.puzzles import PENALIZED_PHASES, PHASE_ORDER
+
+DEFAULT_PHASES = PHASE_ORDER
+COMMANDS = ("pause", "resume", "time", "skip", "reset", "reseed")
+
+
+# Game State Manager
+class GameState:
+    __slots__ = ("current_phase", "status")
+
+    def __init__(self):
+        self.current_phase = 1  # In parallel mode, one more than the modules solved
+        self.status = "armed"  # "armed", "defused", "exploded" or "reset"
+
+    def next_phase(self):
+        self.current_phase += 1
+
+    def check_phase(self):
+        return self.current_phase
+
+
+class Game:
+    def __init__(
+        self,
+        display,
+        inputs,
+        phase_order=DEFAULT_PHASES,
+        countdown=None,
+        seed=None,
+        player="anonymous",
+        config=None,
+    ):
+        """
+        A single bomb: its timer, its phases and the state they share.
+
+        Subscribers are called as callback(event, **data) from whichever game
+        thread caused the event, so GUI subscribers must hand off to their own
+        thread.  Events:
+
+            started                         -- the clock started
+            tick      value                 -- once per second of countdown
+            inputs    phase, values         -- a phase's inputs changed
+            cut       phase, wire, time     -- a wire was cut, once per wire
+            attempt   phase, value, correct -- toggles settled on a new state
+                                               (with config.attempt_events)
+            penalty   phase, value          -- wrong answer, value is time left
+            solved    phase, next           -- phase solved, next is the new phase
+            defused                         -- every phase solved
+            exploded                        -- the countdown ran out
+            reset     seed                  -- an operator ended the game for
+                                               a new one with this seed
+
+        Args:
+            display (Seg7x4): 7-segment display the timer prints to.
+            inputs (dict): Inputs keyed by phase name: pins for "Toggles" and
+                "Wires", the button pin for "Button" (its LEDs under
+                "ButtonRGB") and a matrix keypad for "Keypad".
+            phase_order (tuple): Names of the phases to play, in order.
+            countdown (int): Seconds on the clock; the config's by default.
+            seed (int): Seed for the puzzles, for reproducible games.  One is
+                drawn and kept in `seed` when none is given, so every
+                recorded game can be replayed.
+            player (str): Who is playing, for the results; an operator can
+                name them with the admin "player" command.
+            config (Config): Penalty, question bank, difficulty and whether
+                the modules are played in parallel; the stock DEFAULT_CONFIG
+                by default.
+        """
+        if config is None:
+            # Imported here so `python -m bomb_core.config` runs cleanly
+            from bomb_core.config import DEFAULT_CONFIG as config
+        if countdown is None:
+            countdown = config.countdown
+        self.config = config
+        self.parallel = config.parallel
+        if seed is None:
+            seed = random.getrandbits(32)
+        self.seed = seed
+        self.player = player
+        self.rng = random.Random(seed)
+        self.state = GameState()
+        self._lock = threading.RLock()
+        self._listeners = []
+        self._idle = False
+        self._commands = deque()  # (name, value, done) from operators
+        self._scheduled = False
+
+        # Results, filled in as the game is played
+        self.countdown = countdown
+        self.started_at = None  # Wall-clock start and end, for the results store
+        self.ended_at = None
+        self.solve_times = {}  # Phase name -> seconds spent on it
+        self.penalties = {}  # Phase name -> wrong answers
+        self.interventions = 0  # Operator pauses, time changes and skips
+        self._phase_started = None
+        self._played = 0.0  # Seconds already played, when resumed from a checkpoint
+        self._phase_played = 0.0  # The same, on the current phase
+
+        self.timer = Timer(countdown, display, self)
+        builders = {
+            "Toggles": lambda: Toggles(inputs["Toggles"], self, self.rng),
+            "Button": lambda: Button(inputs["Button"], inputs.get("ButtonRGB"), self),
+            "Keypad": lambda: Keypad(inputs["Keypad"], self, self.rng),
+            "Wires": lambda: Wires(inputs["Wires"], self, self.rng),
+        }
+        self.phases = [builders[name]() for name in phase_order]
+        for phase in self.phases:
+            setattr(self, phase.name.lower(), phase)
+
+    def subscribe(self, callback):
+        self._listeners.append(callback)
+
+    def unsubscribe(self, callback):
+        self._listeners.remove(callback)
+
+    def emit(self, event, **data):
+        for callback in tuple(self._listeners):
+            callback(event, **data)
+
+    def start(self, scheduler=None):
+        """
+        Start the timer and every phase thread.
+
+        Args:
+            scheduler (Scheduler): Run on this shared scheduler's thread
+                instead, with no threads of the game's own.
+        """
+        # A resumed game carries on from the time already played
+        self.started_at = time() - self._played
+        self._phase_started = monotonic() - self._phase_played
+        self.emit("started")
+        if scheduler is not None:
+            self._scheduled = True
+            self.timer._running = True
+            self.timer.show()
+            self._next_tick = monotonic() + 1
+            scheduler.add(self)
+            return
+        self.timer.start()
+        for phase in self.phases:
+            phase.start()
+
+    def step(self, now):
+        """
+        One scheduler pass: count the clock down and poll the live phases.
+
+        Only the phase being played is polled, or in parallel mode every
+        unsolved module, all in this one pass.
+        """
+        timer = self.timer
+        if self._commands:
+            self.apply_commands()
+            if self.state.status != "armed":
+                return  # Ended by a command; the scheduler drops it next pass
+            timer.show()
+        if timer._paused:
+            self._next_tick = now + 1
+        elif now >= self._next_tick:
+            self._next_tick += 1
+            timer.tick()
+            if self.state.status == "armed":
+                timer.show()
+        for phase in self.phases if self.parallel else (self.current(),):
+            if self.state.status != "armed":
+                break
+            if phase is not None and phase._running and self.is_live(phase):
+                phase.poll()
+
+    def idle(self):
+        """
+        Enter the attract state: stop the clock and let every thread sleep.
+
+        Nothing polls until wake() is called, so a frontend must call it when
+        a player touches the station.
+        """
+        with self._lock:
+            if self.state.status == "armed" and not self._idle:
+                self._idle = True
+                if not self.timer._paused:
+                    self.timer.pause()
+
+    def wake(self):
+        """A player touched the station: leave the attract state, if in it."""
+        with self._lock:
+            if self._idle:
+                self._idle = False
+                if self.timer._paused:
+                    self.timer.pause()
+
+    def command(self, name, value=None):
+        """
+        Queue an operator command for the clock's thread to apply.
+
+        The clock applies every queued command at once, under the game lock,
+        before its next tick; before the game starts and after it ends there
+        is no clock running, and the command is applied here instead.  Phase
+        threads never wait on a command.
+
+        Args:
+            name (str): One of COMMANDS:
+                pause, resume -- stop or restart the clock
+                time          -- add `value` seconds; negative takes time off
+                skip          -- count the phase being played as solved
+                reset         -- end the game for a new one with the same seed
+                reseed        -- end the game for a new one seeded with
+                                 `value`, or a random seed
+            value (int): The command's argument, if it takes one.
+
+        Returns:
+            threading.Event: Set once the command has been applied.
+
+        Raises:
+            ValueError: For an unknown command or a missing argument.
+        """
+        if name not in COMMANDS:
+            raise ValueError(f"unknown command {name!r}")
+        if name == "time" and value is None:
+            raise ValueError("time needs a number of seconds")
+        done = threading.Event()
+        self._commands.append((name, value, done))
+        if self.timer._running:
+            self.timer.wake()
+        # The clock may have stopped since; applying twice is harmless
+        if not self.timer._running:
+            self.apply_commands()
+        return done
+
+    def apply_commands(self):
+        """Apply the queued operator commands together, under the game lock."""
+        with self._lock:
+            while self._commands:
+                name, value, done = self._commands.popleft()
+                self._apply(name, value)
+                done.set()
+
+    def _apply(self, name, value):
+        armed = self.state.status == "armed"
+        if name in ("pause", "resume"):
+            self._idle = False
+            if armed and self.timer._paused != (name == "pause"):
+                self.interventions += 1
+                self.timer.pause()
+        elif name == "time" and armed:
+            self.interventions += 1
+            self.timer._value = max(0, self.timer._value + value)
+            if self.timer._value <= 0:
+                self.explode()
+        elif name == "skip" and armed:
+            phase = self.current()
+            if phase is not None:
+                self.interventions += 1
+                phase.solve()
+        elif name in ("reset", "reseed"):
+            if name == "reset":
+                seed = self.seed
+            else:
+                seed = value if value is not None else random.getrandbits(32)
+            if armed:
+                # Neither defused nor exploded: kept out of the results
+                self.state.status = "reset"
+                if self.started_at is not None:
+                    self.ended_at = time()
+            self.stop()
+            self._commands.clear()  # Nothing is left to apply them to
+            self.emit("reset", seed=seed)
+
+    def wake_threads(self, timer=True):
+        """Cut every thread's current sleep short so it looks at the game again."""
+        if timer:
+            self.timer.wake()
+        for phase in self.phases:
+            phase.wake()
+
+    def wakeup_report(self):
+        """
+        One-line summary of how often the game's threads woke, by mode.
+
+        Every rate is per second of wall time since the start, so a mode a
+        thread slept in only briefly shows a small rate, not the inverse of
+        that one short sleep.  The share is how much of all the threads' time
+        was spent asleep in the mode.
+        """
+        threads = (self.timer, *self.phases)
+        wakeups, slept = {}, {}
+        for thread in threads:
+            for mode, count in thread.wakeups.items():
+                wakeups[mode] = wakeups.get(mode, 0) + count
+                slept[mode] = slept.get(mode, 0.0) + thread.slept[mode]
+        elapsed = max((self.ended_at or time()) - self.started_at, 1e-3)
+        modes = ", ".join(
+            f"{mode} {wakeups[mode] / elapsed:.1f}/s "
+            f"({slept[mode] / (elapsed * len(threads)):.0%} of thread time)"
+            for mode in ("active", "backoff", "waiting", "paused", "clock", "pwm")
+            if wakeups.get(mode)
+        )
+        return (
+            f"wakeups: {sum(wakeups.values()) / elapsed:.1f}/s over {elapsed:.0f}s; "
+            f"by mode: {modes}"
+        )
+
+    def stop(self):
+        """Stop the timer and every phase thread."""
+        self.timer.stop()
+        for phase in self.phases:
+            phase.stop()
+
+    def current(self):
+        """
+        The phase being played, or None once the game is over.
+
+        In parallel mode every unsolved module is being played; this is the
+        first of them.
+        """
+        if self.parallel:
+            for phase in self.phases:
+                if not phase._solved:
+                    return phase
+            return None
+        index = self.state.check_phase() - 1
+        return self.phases[index] if index < len(self.phases) else None
+
+    def is_live(self, phase):
+        """Whether `phase` is being played and should poll at full rate."""
+        if self.parallel:
+            return not phase._solved and self.state.status == "armed"
+        return self.current() is phase
+
+    def penalize(self, phase):
+        """Charge a wrong answer in `phase`, if PENALIZED_PHASES says it costs time."""
+        if phase.name not in PENALIZED_PHASES:
+            return
+        with self._lock:
+            if self.state.status != "armed":
+                return
+            self.timer.apply_penalty()
+            self.penalties[phase.name] = self.penalties.get(phase.name, 0) + 1
+            self.emit("penalty", phase=phase.name, value=self.timer._value)
+            if self.timer._value <= 0:
+                self.explode()
+
+    def phase_solved(self, phase):
+        """Advance past every solved phase, in order, and defuse after the last."""
+        with self._lock:
+            if self.state.status != "armed":
+                return
+            if self.parallel:
+                # Modules fall in any order; each is timed from the start
+                self.solve_times[phase.name] = monotonic() - self._phase_started
+                self.state.next_phase()
+                self.emit("solved", phase=phase.name, next=self.state.current_phase)
+            # In parallel mode the current phase is never a solved one
+            current = self.current()
+            while current is not None and current._solved:
+                now = monotonic()
+                self.solve_times[current.name] = now - self._phase_started
+                self._phase_started = now
+                self.state.next_phase()
+                self.emit("solved", phase=current.name, next=self.state.current_phase)
+                current = self.current()
+            # The next phase may be mid-way through a long wait; start it now
+            self.wake_threads(timer=False)
+            if current is None:
+                self.state.status = "defused"
+                self.ended_at = time()
+                self.stop()
+                self.emit("defused")
+
+    def explode(self):
+        with self._lock:
+            if self.state.status != "armed":
+                return
+            self.state.status = "exploded"
+            self.ended_at = time()
+            self.stop()
+            self.emit("exploded")
@@ -0,0 +1,142 @@
+"""
+Matrix keypad scanner with cached, minimal-write scans.
+
+adafruit_matrixkeypad.Matrix_Keypad rescans the whole matrix on every read of
+pressed_keys, reconfiguring every row and column pin each time: 30 pin writes
+and 12 reads for a 4x3 pad.  KeypadScanner configures the columns once and
+parks every row driven low, so a scan with no key down is three column reads
+and no writes at all.  Only when a column reads low are the rows walked, one
+released and the next driven per step (12 writes), and the result is cached
+so every reader within `max_age` shares the same scan.
+
+Rows are only ever driven low or left floating, never driven high, so two
+keys held in one column cannot short a high row to a low one.
+
+Usage (on the Pi, compares both scanners on the configured pins):
+    python -m bomb_core.keypad --scans 2000
+"""
+import argparse
+from math import inf
+from time import monotonic, perf_counter, thread_time
+
+from digitalio import Pull
+
+from bomb_core.config import DEFAULT_CONFIG, config_from_environment
+
+
+class KeypadScanner:
+    def __init__(self, rows, cols, keys, max_age=0.01):
+        """
+        A drop-in replacement for Matrix_Keypad.
+
+        Args:
+            rows (list): Row DigitalInOut pins.
+            cols (list): Column DigitalInOut pins.
+            keys (tuple): Key legends, one tuple per row.
+            max_age (float): Seconds a scan's result is reused for.
+        """
+        self._rows = rows
+        self._cols = cols
+        self._keys = keys
+        self._max_age = max_age
+        self._pressed = []
+        self._scanned_at = -inf
+        for pin in cols:
+            pin.switch_to_input(pull=Pull.UP)
+        for pin in rows:
+            pin.switch_to_output(value=False)
+        self.scans = 0
+        self.row_scans = 0
+        self.writes = len(cols) + len(rows)
+        self.scan_time = 0.0
+
+    @property
+    def pressed_keys(self):
+        """Keys held down, from a scan no older than `max_age`."""
+        now = monotonic()
+        if now - self._scanned_at >= self._max_age:
+            self._scanned_at = now
+            self.scan()
+        return self._pressed
+
+    def scan(self):
+        """Scan the matrix now and cache the result."""
+        start = perf_counter()
+        # Every row is driven low between scans: an all-high column read
+        # means no key is down anywhere
+        for pin in self._cols:
+            if not pin.value:
+                self._pressed = self._scan_rows()
+                break
+        else:
+            self._pressed = []
+        self.scans += 1
+        self.scan_time += perf_counter() - start
+        return self._pressed
+
+    def _scan_rows(self):
+        rows = self._rows
+        for pin in rows[1:]:
+            pin.switch_to_input(pull=Pull.UP)
+        pressed = []
+        for r, row in enumerate(rows):
+            if r:
+                rows[r - 1].switch_to_input(pull=Pull.UP)
+                row.switch_to_output(value=False)
+            for c, col in enumerate(self._cols):
+                if not col.value:
+                    pressed.append(self._keys[r][c])
+        # Back to every row driven low, ready for the next idle scan
+        for pin in rows[:-1]:
+            pin.switch_to_output(value=False)
+        self.row_scans += 1
+        self.writes += 4 * (len(rows) - 1)
+        return pressed
+
+    def report(self):
+        """One-line summary of the scans so far."""
+        per_scan = self.scan_time / self.scans * 1e6 if self.scans else 0.0
+        return (
+            f"keypad: {self.scans} scans ({self.row_scans} with a key down), "
+            f"{per_scan:.0f} us per scan, {self.writes} pin writes"
+        )
+
+
+def _time_scans(read, scans):
+    """Time `scans` calls of `read`: (wall seconds, CPU seconds)."""
+    wall, cpu = perf_counter(), thread_time()
+    for _ in range(scans):
+        read()
+    return perf_counter() - wall, thread_time() - cpu
+
+
+def main(argv=None):
+    # Hardware only: importing board claims the Pi's pins
+    import board
+    from adafruit_matrixkeypad import Matrix_Keypad
+    from digitalio import DigitalInOut
+
+    parser = argparse.ArgumentParser(description="Compare keypad scanners")
+    parser.add_argument("--scans", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    config_file = config_from_environment()
+    config = config_file.current() if config_file else DEFAULT_CONFIG
+    pins = config.board_pins(board)
+    rows = [DigitalInOut(pin) for pin in pins["keypad_rows"]]
+    cols = [DigitalInOut(pin) for pin in pins["keypad_cols"]]
+
+    library = Matrix_Keypad(rows, cols, config.keypad_keys)
+    results = [("Matrix_Keypad", _time_scans(lambda: library.pressed_keys, args.scans))]
+    scanner = KeypadScanner(rows, cols, config.keypad_keys, max_age=0)
+    results.append(("KeypadScanner", _time_scans(scanner.scan, args.scans)))
+    for name, (wall, cpu) in results:
+        print(
+            f"{name:<14} {wall / args.scans * 1e6:8.1f} us per scan, "
+            f"{cpu / args.scans * 1e6:8.1f} us CPU, {args.scans / wall:8.0f} scans/s"
+        )
+    print(scanner.report())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Software-PWM driver for the button's RGB LED, and the colour patterns it shows.
+
+Colours are (red, green, blue) duty cycles from 0 to 1.  A colour with only
+full-on and full-off channels is written once and held; anything in between is
+rendered as software PWM.  Each PWM period turns on every lit channel in one
+batch, then turns channels off in batches at their duty deadlines, sleeping
+until each deadline in between.  Deadlines are chained from a fixed origin so
+late wakeups do not accumulate, and how late each wakeup was is recorded as
+jitter.
+"""
+from collections import deque
+from math import cos, pi
+from time import monotonic
+
+OFF = (0.0, 0.0, 0.0)
+RED = (1.0, 0.0, 0.0)
+GREEN = (0.0, 1.0, 0.0)
+BLUE = (0.0, 0.0, 1.0)
+AMBER = (1.0, 0.35, 0.0)
+
+
+def scale(colour, level):
+    return tuple(channel * level for channel in colour)
+
+
+def blink(colour, hz, now):
+    """`colour` for the first half of each cycle, off for the second."""
+    return colour if (now * hz) % 1.0 < 0.5 else OFF
+
+
+def pulse(colour, hz, now):
+    """`colour` fading smoothly in and out `hz` times a second."""
+    return scale(colour, 0.5 - 0.5 * cos(2 * pi * hz * now))
+
+
+class RgbLed:
+    def __init__(self, pins, active_low=True, period=0.01, levels=16):
+        """
+        An RGB LED on three digital pins.
+
+        Args:
+            pins (list): Red, green and blue DigitalInOut pins, set as outputs.
+            active_low (bool): A low pin lights its colour, as on the
+                button's common-anode LED.
+            period (float): Seconds per PWM cycle; 10 ms does not flicker.
+            levels (int): Brightness steps per channel; duties are rounded to
+                these so nearby colours share deadlines.
+        """
+        self._pins = pins
+        self._on = not active_low
+        self._period = period
+        self._levels = levels
+        self._written = [None] * len(pins)
+        self.jitter = deque(maxlen=4096)  # Seconds late, most recent wakeups
+        self.writes = 0
+        self.periods = 0
+
+    def write(self, lit):
+        """Set every channel on or off in one batch, skipping unchanged pins."""
+        for i, on in enumerate(lit):
+            if self._written[i] != on:
+                self._pins[i].value = self._on if on else not self._on
+                self._written[i] = on
+                self.writes += 1
+
+    def hold(self, colour):
+        """Light `colour` with each channel fully on or off, and leave it lit."""
+        self.write([channel >= 0.5 for channel in colour])
+
+    def show(self, colour, until, sleep_until):
+        """
+        Show `colour` until the deadline `until`.
+
+        Args:
+            colour (tuple): (red, green, blue) duties from 0 to 1.
+            until (float): monotonic() deadline to return by.
+            sleep_until (callable): Called with a monotonic() deadline; must
+                not return before it unless the caller is stopping.
+        """
+        duties = [round(channel * self._levels) for channel in colour]
+        if all(duty in (0, self._levels) for duty in duties):
+            self.write([duty > 0 for duty in duties])
+            sleep_until(until)
+            return
+
+        # Off edges in duty order, channels sharing a duty switched together
+        edges = sorted(
+            (duty, [i for i, d in enumerate(duties) if d == duty])
+            for duty in set(duties)
+            if 0 < duty < self._levels
+        )
+        start = monotonic()
+        while start < until:
+            lit = [duty > 0 for duty in duties]
+            self.write(lit)
+            for duty, channels in edges:
+                deadline = start + self._period * duty / self._levels
+                self._wait(deadline, sleep_until)
+                for i in channels:
+                    lit[i] = False
+                self.write(lit)
+            start += self._period
+            self._wait(start, sleep_until)
+            self.periods += 1
+            late = monotonic() - start
+            if late > self._period:
+                start = monotonic()  # Fell a whole period behind; start afresh
+
+    def _wait(self, deadline, sleep_until):
+        sleep_until(deadline)
+        self.jitter.append(monotonic() - deadline)
+
+    def report(self):
+        """One-line summary of the PWM timing."""
+        jitter = sorted(self.jitter)
+        if not jitter:
+            return f"led: {self.writes} pin writes, no PWM"
+        p50 = jitter[len(jitter) // 2]
+        p99 = jitter[min(len(jitter) - 1, int(len(jitter) * 0.99))]
+        return (
+            f"led: {self.periods} PWM periods, {self.writes} pin writes, "
+            f"jitter p50 {p50 * 1000:.2f} ms p99 {p99 * 1000:.2f} ms "
+            f"max {jitter[-1] * 1000:.2f} ms"
+        )
@@ -0,0 +1,112 @@
+"""
+Memory profiling across game boundaries.
+
+With BOMB_TRACEMALLOC=<frames> set, tracemalloc records where every live
+allocation came from.  Each time a game ends a snapshot is taken and compared
+with the one from the first game to end -- by then imports, caches and the Qt
+widgets have all been allocated once -- and the source lines whose live memory
+grew the most are printed along with the RSS.  On a station that stays flat the
+report shows no growth, however many games are played; anything that keeps a
+little of every game alive shows up at the top.
+
+Tracing slows every allocation down, so leave it off in normal play.
+"""
+import gc
+import os
+import sys
+import tracemalloc
+
+from bomb_core.solver import rss_bytes
+
+# Allocations made by tracemalloc and the import machinery are not the game's
+IGNORED = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+class MemoryTracer:
+    def __init__(self, frames=10, top=5):
+        """
+        Snapshots of the live allocations at game boundaries.
+
+        Args:
+            frames (int): Stack frames recorded per allocation.
+            top (int): Source lines listed per report.
+        """
+        self._frames = frames
+        self._top = top
+        self._baseline = None
+        self._baseline_rss = 0
+        self.snapshots = 0
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self._frames)
+
+    def attach(self, game):
+        """Take a snapshot and print the report whenever `game` ends."""
+
+        def on_game_event(event, **data):
+            if event in ("defused", "exploded", "reset"):
+                print(self.snapshot(), file=sys.stderr, flush=True)
+
+        game.subscribe(on_game_event)
+
+    def snapshot(self):
+        """
+        Snapshot the live allocations now; call between games.
+
+        Returns:
+            str: The report: growth since the first snapshot, by source line.
+        """
+        gc.collect()  # Count what is still reachable, not what awaits collection
+        snapshot = tracemalloc.take_snapshot().filter_traces(IGNORED)
+        rss = rss_bytes()
+        self.snapshots += 1
+        traced = sum(stat.size for stat in snapshot.statistics("filename"))
+        if self._baseline is None:
+            self._baseline, self._baseline_rss = snapshot, rss
+            return (
+                f"memory: baseline {traced / 2**10:.0f} KiB traced, "
+                f"rss {rss / 2**20:.1f} MiB"
+            )
+        stats = snapshot.compare_to(self._baseline, "lineno")
+        grown = sum(stat.size_diff for stat in stats)
+        lines = [
+            f"memory: snapshot {self.snapshots}, {traced / 2**10:.0f} KiB traced "
+            f"({grown / 2**10:+.1f} KiB), rss {rss / 2**20:.1f} MiB "
+            f"({(rss - self._baseline_rss) / 2**10:+.0f} KiB)"
+        ]
+        for stat in stats[: self._top]:
+            if stat.size_diff <= 0:
+                break
+            frame = stat.traceback[0]
+            lines.append(
+                f"  {stat.size_diff / 2**10:+8.1f} KiB {stat.count_diff:+6d} blocks  "
+                f"{frame.filename}:{frame.lineno}"
+            )
+        return "\n".join(lines)
+
+
+def memory_tracer_from_environment(games=()):
+    """
+    Start tracing allocations if BOMB_TRACEMALLOC is set.
+
+    The variable's value is the number of stack frames kept per allocation.
+    Each game in `games` reports when it ends; games built later can be
+    attached, or snapshot() called directly at each boundary.
+
+    Returns:
+        MemoryTracer: The running tracer, or None when tracing is off.
+    """
+    frames = os.environ.get("BOMB_TRACEMALLOC")
+    if not frames:
+        return None
+    tracer = MemoryTracer(int(frames))
+    tracer.start()
+    for game in games:
+        tracer.attach(game)
+    return tracer
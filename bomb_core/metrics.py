@@ -0,0 +1,315 @@
+"""
+OpenMetrics endpoint for station monitoring.
+
+A small HTTP server on loopback or a Unix socket serves the station's counters
+and histograms in the OpenMetrics text format, for a local Prometheus-style
+collector to scrape:
+
+    bomb_games_total{outcome}        games started, defused and exploded
+    bomb_penalties_total{phase}      wrong answers
+    bomb_solve_seconds{phase}        time spent solving each phase, unaided
+    bomb_loop_lateness_seconds{loop} how late each timed sleep woke up
+    bomb_display_writes_total        I2C writes to the 7-segment display
+    bomb_gui_repaints_total          widget updates made by the GUI
+
+Every number lives in a slot allocated when a game is attached, and each slot
+has one writer: a game's counters are only written under that game's lock, a
+loop's lateness only by that loop.  Recording is an array increment, and a
+scrape only reads, so it never takes a lock the game threads hold; only
+attaching a new game or window may wait for a scrape to finish.
+
+When a new game is attached, as after an operator reset, the slots of games
+that have finished are folded into running totals and the games let go; a
+GUI's render scheduler is let go the same way once a new window replaces it.
+
+Enable with BOMB_METRICS=<port> for 127.0.0.1:<port>, or BOMB_METRICS=<path>
+for a Unix socket:
+
+    curl -s localhost:9470/metrics
+    curl -s --unix-socket /run/bomb/metrics.sock http://station/metrics
+"""
+import os
+import socketserver
+from array import array
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from threading import Lock, Thread
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+PHASES = ("Toggles", "Button", "Keypad", "Wires")
+OUTCOMES = ("started", "defused", "exploded")
+SOLVE_BUCKETS = (5.0, 10.0, 20.0, 30.0, 45.0, 60.0, 90.0, 120.0, 180.0, 300.0)
+LATENESS_BUCKETS = (0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.25, 1.0)
+
+
+class Histogram:
+    def __init__(self, bounds):
+        """
+        Fixed buckets for one series; observe() from a single thread only.
+
+        Args:
+            bounds (tuple): Upper bucket bounds, ascending; +Inf is added.
+        """
+        self.bounds = tuple(bounds)
+        self.buckets = array("q", [0] * (len(self.bounds) + 1))
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.buckets[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+    def add(self, other):
+        """Add the observations of `other`, which has the same bounds."""
+        for i, count in enumerate(other.buckets):
+            self.buckets[i] += count
+        self.sum += other.sum
+
+
+def _labels(**labels):
+    return "{" + ",".join(f'{key}="{value}"' for key, value in labels.items()) + "}"
+
+
+def _histogram_lines(name, histograms, **labels):
+    """Sample lines for the sum of `histograms`, which share their bounds."""
+    bounds = histograms[0].bounds
+    counts = [0] * (len(bounds) + 1)
+    total = 0.0
+    for histogram in histograms:
+        for i, count in enumerate(histogram.buckets):
+            counts[i] += count
+        total += histogram.sum
+    lines = []
+    cumulative = 0
+    for bound, count in zip((*bounds, "+Inf"), counts):
+        cumulative += count
+        lines.append(f"{name}_bucket{_labels(**labels, le=bound)} {cumulative}")
+    lines.append(f"{name}_count{_labels(**labels)} {cumulative}")
+    lines.append(f"{name}_sum{_labels(**labels)} {total}")
+    return lines
+
+
+class GameMetrics:
+    def __init__(self):
+        """One game's counters; written only by its threads, under its lock."""
+        self.outcomes = array("q", [0] * len(OUTCOMES))
+        self.penalties = array("q", [0] * len(PHASES))
+        self.solve_times = [Histogram(SOLVE_BUCKETS) for _ in PHASES]
+
+    def add(self, other):
+        """Add the counts of `other` to these."""
+        for mine, theirs in ((self.outcomes, other.outcomes), (self.penalties, other.penalties)):
+            for i, count in enumerate(theirs):
+                mine[i] += count
+        for mine, theirs in zip(self.solve_times, other.solve_times):
+            mine.add(theirs)
+
+
+class MetricsServer(Thread):
+    def __init__(self, address, name="Metrics"):
+        """
+        Serves the metrics of the attached games over HTTP.
+
+        Args:
+            address (int or str): A TCP port on 127.0.0.1, or the path of a
+                Unix socket to create.
+            name (str): Thread name.
+        """
+        super().__init__(name=name, daemon=True)
+        self._games = []  # (game, GameMetrics)
+        self._loops = []  # (game, loop name, its lateness Histogram)
+        self._renders = []
+        # What the games and renders that were let go had counted
+        self._finished = GameMetrics()
+        self._finished_loops = {}  # Loop name -> Histogram
+        self._finished_writes = 0
+        self._finished_repaints = 0
+        self._lock = Lock()  # Taken by scrapes and folds, never by game threads
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # A scrape every few seconds is not worth a log line
+
+            def address_string(self):
+                return "local"
+
+        if isinstance(address, int):
+            self._server = HTTPServer(("127.0.0.1", address), Handler)
+        else:
+            if os.path.exists(address):
+                os.unlink(address)
+            self._server = _UnixHTTPServer(address, Handler)
+        self.address = address
+
+    def attach(self, game):
+        """
+        Count `game`'s events and time its loops from now on.
+
+        Games attached earlier whose loops have all stopped are folded into
+        the running totals first.
+        """
+        self._fold_finished()
+        counts = GameMetrics()
+        if game.started_at is not None:
+            counts.outcomes[0] += 1
+        self._games.append((game, counts))
+        for loop in (game.timer, *game.phases):
+            lateness = Histogram(LATENESS_BUCKETS)
+            self._loops.append((game, loop.name, lateness))
+            loop._lateness = lateness
+
+        def on_game_event(event, **data):
+            if event == "started":
+                counts.outcomes[0] += 1
+            elif event in ("defused", "exploded"):
+                counts.outcomes[OUTCOMES.index(event)] += 1
+            elif event == "penalty":
+                counts.penalties[PHASES.index(data["phase"])] += 1
+            elif event == "solved" and not game.interventions:
+                # Once an operator has stepped in, solve times are not the player's
+                phase = data["phase"]
+                counts.solve_times[PHASES.index(phase)].observe(
+                    game.solve_times[phase]
+                )
+
+        game.subscribe(on_game_event)
+
+    def watch_render(self, render, replaces=None):
+        """
+        Count the widget updates of a GUI's RenderScheduler.
+
+        Args:
+            render (RenderScheduler): The new GUI's scheduler.
+            replaces (RenderScheduler): The scheduler of the window the new
+                one replaces, whose count is kept but which is let go.
+        """
+        with self._lock:
+            if replaces in self._renders:
+                self._renders.remove(replaces)
+                self._finished_repaints += replaces.repaints
+            self._renders.append(render)
+
+    def _fold_finished(self):
+        finished = [
+            game
+            for game, _ in self._games
+            if all(
+                not loop._running and not loop.is_alive()
+                for loop in (game.timer, *game.phases)
+            )
+        ]
+        if not finished:
+            return
+        with self._lock:
+            for game, counts in self._games:
+                if game in finished:
+                    self._finished.add(counts)
+                    self._finished_writes += game.timer.display_writes
+            for game, name, lateness in self._loops:
+                if game in finished:
+                    total = self._finished_loops.get(name)
+                    if total is None:
+                        total = self._finished_loops[name] = Histogram(LATENESS_BUCKETS)
+                    total.add(lateness)
+            self._games = [entry for entry in self._games if entry[0] not in finished]
+            self._loops = [entry for entry in self._loops if entry[0] not in finished]
+        for game in finished:
+            for loop in (game.timer, *game.phases):
+                loop._lateness = None
+
+    def render(self):
+        """The current metrics, as an OpenMetrics text exposition."""
+        with self._lock:
+            return self._render()
+
+    def _render(self):
+        games = [(None, self._finished), *self._games]
+        lines = ["# TYPE bomb_games counter", "# HELP bomb_games Games by outcome."]
+        for i, outcome in enumerate(OUTCOMES):
+            total = sum(counts.outcomes[i] for _, counts in games)
+            lines.append(f"bomb_games_total{_labels(outcome=outcome)} {total}")
+
+        lines += ["# TYPE bomb_penalties counter", "# HELP bomb_penalties Wrong answers."]
+        for i, phase in enumerate(PHASES):
+            total = sum(counts.penalties[i] for _, counts in games)
+            lines.append(f"bomb_penalties_total{_labels(phase=phase)} {total}")
+
+        lines += [
+            "# TYPE bomb_solve_seconds histogram",
+            "# UNIT bomb_solve_seconds seconds",
+            "# HELP bomb_solve_seconds Time spent solving a phase.",
+        ]
+        for i, phase in enumerate(PHASES):
+            histograms = [counts.solve_times[i] for _, counts in games]
+            if histograms:
+                lines += _histogram_lines("bomb_solve_seconds", histograms, phase=phase)
+
+        lines += [
+            "# TYPE bomb_loop_lateness_seconds histogram",
+            "# UNIT bomb_loop_lateness_seconds seconds",
+            "# HELP bomb_loop_lateness_seconds How late a loop woke from a timed sleep.",
+        ]
+        loops = {name: [histogram] for name, histogram in self._finished_loops.items()}
+        for _, name, histogram in self._loops:
+            loops.setdefault(name, []).append(histogram)
+        for name, histograms in loops.items():
+            lines += _histogram_lines("bomb_loop_lateness_seconds", histograms, loop=name)
+
+        writes = self._finished_writes + sum(
+            game.timer.display_writes for game, _ in self._games
+        )
+        repaints = self._finished_repaints + sum(render.repaints for render in self._renders)
+        lines += [
+            "# TYPE bomb_display_writes counter",
+            "# HELP bomb_display_writes I2C writes to the 7-segment display.",
+            f"bomb_display_writes_total {writes}",
+            "# TYPE bomb_gui_repaints counter",
+            "# HELP bomb_gui_repaints Widget updates made by the GUI.",
+            f"bomb_gui_repaints_total {repaints}",
+            "# EOF",
+        ]
+        return "\n".join(lines) + "\n"
+
+    def stop(self):
+        self._server.shutdown()
+
+    def run(self):
+        self._server.serve_forever(poll_interval=0.5)
+        self._server.server_close()
+
+
+class _UnixHTTPServer(socketserver.UnixStreamServer):
+    def get_request(self):
+        request, _ = super().get_request()
+        return request, ("local", 0)  # BaseHTTPRequestHandler wants a (host, port)
+
+
+def metrics_from_environment(games):
+    """
+    Serve metrics for `games` if BOMB_METRICS is set.
+
+    The variable's value is a TCP port on 127.0.0.1 or a Unix socket path.
+    Attach a GUI's render scheduler with watch_render() once it is built.
+
+    Returns:
+        MetricsServer: The running server, or None when metrics are off.
+    """
+    address = os.environ.get("BOMB_METRICS")
+    if not address:
+        return None
+    server = MetricsServer(int(address) if address.isdigit() else address)
+    for game in games:
+        server.attach(game)
+    server.start()
+    return server
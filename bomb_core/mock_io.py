@@ -0,0 +1,73 @@
+"""
+Stand-ins for the board I/O so the game can run without the Pi hardware.
+
+They mimic the parts of DigitalInOut, Seg7x4 and Matrix_Keypad the game uses,
+and can be driven from the keyboard listener or the solver bot.
+"""
+from time import monotonic
+
+
+class MockPin:
+    def __init__(self, initial_value=False):
+        self._value = initial_value
+
+    @property
+    def value(self):
+        return self._value
+
+    @value.setter
+    def value(self, val):
+        self._value = val
+
+    def toggle(self):
+        self._value = not self._value
+
+    # Mimic DigitalInOut interface
+    direction = None
+    pull = None
+
+
+class MockSeg7x4:
+    def __init__(self, verbose=True):
+        self.text = ""
+        self.brightness = 0.5
+        self.verbose = verbose
+
+    def print(self, text):
+        self.text = text
+        if self.verbose:
+            print(f"Display: {text}")
+
+
+class MockMatrixKeypad:
+    def __init__(self, rows, cols, keys, verbose=True, hold_time=0.2):
+        """
+        A keypad whose keys are pressed from code.
+
+        A simulated press is held for `hold_time` seconds and then released, like
+        a finger on the real keypad, unless clear_keys() releases it sooner.
+        """
+        self.rows = rows
+        self.cols = cols
+        self.keys = keys
+        self.flat_keys = [key for row in keys for key in row]
+        self.verbose = verbose
+        self.hold_time = hold_time
+        self._pressed = []
+        self._pressed_at = 0.0
+
+    @property
+    def pressed_keys(self):
+        if self._pressed and monotonic() - self._pressed_at > self.hold_time:
+            self._pressed = []
+        return self._pressed
+
+    def simulate_key_press(self, key):
+        if key in self.flat_keys:
+            self._pressed = [key]
+            self._pressed_at = monotonic()
+            if self.verbose:
+                print(f"Simulated Keypad Press: {key}")
+
+    def clear_keys(self):
+        self._pressed = []
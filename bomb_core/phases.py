@@ -0,0 +1,416 @@
+"""
+The timer and the puzzle phases, independent of any frontend.
+
+Each phase polls its inputs and reports to the Game it belongs to; frontends
+never read pins or touch phase internals, they subscribe to the Game instead.
+
+Polling adapts to what is going on.  The phase being played -- in parallel
+mode, every unsolved module -- polls every `interval` while its inputs change
+and backs off, doubling the wait, to `max_interval` while they do not.  Phases
+waiting their turn check in every `idle_interval`, and every phase sleeps
+outright while the clock is paused or the game is idle, until the game wakes
+it.  Each phase has its own loop, so a module responds as quickly with four
+modules live as with one.
+
+Those loops are how a standalone station runs, in parallel mode too: each
+live module samples its inputs on its own thread, and the Button's LED and
+the watchdog heartbeats are driven from them.  Only games on an arena
+Scheduler are stepped instead, by Game.step(), which polls every live module
+in one pass on the scheduler's thread.
+"""
+import random
+import threading
+from math import inf
+from threading import Thread
+from time import monotonic, time
+
+from bomb_core.clock import clock_face
+from bomb_core.leds import BLUE, GREEN, OFF, RED, RgbLed, blink, pulse
+from bomb_core.puzzles import (
+    apply_penalty,
+    choose_wires_question,
+    generate_keypad,
+    generate_toggles,
+)
+
+
+def read_bitmask(pins):
+    """Read every pin once into an int, first pin in bit 0."""
+    mask = 0
+    for i, pin in enumerate(pins):
+        if pin.value:
+            mask |= 1 << i
+    return mask
+
+
+# Base Phase Thread
+class PhaseThread(Thread):
+    _heartbeat = None  # (deadlines array, slot), set by a watching Watchdog
+    _lateness = None  # Histogram of late wakeups, set by a MetricsServer
+    interval = 0.05  # Seconds between polls while the inputs are changing
+    max_interval = 0.1  # Longest back-off; presses shorter than this can be missed
+    idle_interval = 1.0  # Seconds between polls while another phase is played
+
+    def __init__(self, game, name):
+        super().__init__(name=name, daemon=True)
+        self._game = game
+        self._running = True
+        self._solved = False
+        self._wake = threading.Event()
+        self.wakeups = {}  # Mode -> times woken
+        self.slept = {}  # Mode -> seconds asleep
+        self.longest_poll = 0.0  # Most seconds spent awake between sleeps
+        self._woke = None
+
+    def stop(self):
+        self._running = False
+        self._wake.set()
+
+    def wake(self):
+        """Cut the current sleep short."""
+        self._wake.set()
+
+    def poll(self):
+        """
+        Read the inputs once and react to them.
+
+        Returns:
+            bool: Whether the inputs changed since the last poll.
+        """
+        raise NotImplementedError
+
+    def run(self):
+        delay = self.interval
+        while self._running:
+            if self._game.timer._paused:
+                self._sleep("paused")
+                continue
+            if not self._game.is_live(self):
+                self.poll()
+                self._sleep("waiting", self.idle_interval)
+                delay = self.interval
+                continue
+            if self.poll():
+                delay = self.interval
+            else:
+                delay = min(delay * 2, self.max_interval)
+            self._sleep("active" if delay == self.interval else "backoff", delay)
+
+    def _sleep(self, mode, timeout=None):
+        """
+        Sleep until `timeout` or wake(), counting the wakeup against `mode`.
+
+        This is also the loop's heartbeat: a watchdog expects the thread back
+        by the end of the sleep, and asleep again soon after it wakes.
+        """
+        start = monotonic()
+        if self._woke is not None:
+            self.longest_poll = max(self.longest_poll, start - self._woke)
+        heartbeat = self._heartbeat
+        if heartbeat is not None:
+            heartbeat[0][heartbeat[1]] = start + timeout if timeout is not None else inf
+        woken = self._wake.wait(timeout)
+        self._wake.clear()
+        self._woke = monotonic()
+        if heartbeat is not None:
+            heartbeat[0][heartbeat[1]] = self._woke
+        if not woken and timeout is not None and self._lateness is not None:
+            self._lateness.observe(self._woke - start - timeout)
+        self.wakeups[mode] = self.wakeups.get(mode, 0) + 1
+        self.slept[mode] = self.slept.get(mode, 0.0) + self._woke - start
+
+    def solve(self):
+        self._solved = True
+        self._running = False
+        self._game.phase_solved(self)
+
+
+# Timer Phase
+class Timer(PhaseThread):
+    def __init__(self, value, display, game, name="Timer"):
+        """
+        The countdown clock.
+
+        `_value`, the seconds left, is the only state a reader needs: it is
+        one int, so any thread can read it without a lock, and str(timer) or
+        face.text() turns it into "mm:ss" from a precomputed table.
+        """
+        super().__init__(game, name)
+        self._value = value
+        self.face = clock_face(value)
+        self.display_writes = 0
+        # Ticks fall on whole seconds of _clock from the start, not a second
+        # after the last tick finished, so the countdown does not drift
+        self._clock = monotonic
+        self._next_tick = None
+        self._display = display
+        self._paused = False
+        self._running = False
+
+    def apply_penalty(self):
+        self._value = apply_penalty(self._value, self._game.config.penalty)
+
+    def show(self):
+        """Put the time left on the display and tell the game's subscribers."""
+        value = self._value
+        self.face.show(self._display, value)
+        self.display_writes += 1
+        self._game.emit("tick", value=value)
+
+    def tick(self):
+        """Take one second off the clock, exploding when it runs out."""
+        self._value -= 1
+        if self._value <= 0:
+            self._game.explode()
+
+    def anchor(self, clock, start):
+        """
+        Tick on a shared schedule instead of from whenever run() starts.
+
+        Args:
+            clock (callable): The shared clock, such as a synced station's.
+            start (float): When the countdown starts on `clock`; the first
+                tick is a second later.  A start in the past is caught up on.
+        """
+        self._clock = clock
+        self._next_tick = start + 1
+
+    def run(self):
+        self._running = True
+        show = True
+        while self._running and self._value > 0:
+            if self._game._commands:
+                self._game.apply_commands()
+                show = True
+                continue
+            if self._paused:
+                self._sleep("paused")
+                # A pause cuts the second short; it does not count
+                self._next_tick = None
+                show = True
+                continue
+            if self._next_tick is None:
+                self._next_tick = self._clock() + 1
+            if show:
+                self.show()
+                show = False
+            left = self._next_tick - self._clock()
+            if left > 0:
+                self._sleep("clock", left)
+                continue
+            self._next_tick += 1
+            self.tick()
+            show = True
+        self._running = False
+        if self._game._commands:
+            self._game.apply_commands()  # Queued as the clock stopped
+
+    def pause(self):
+        """Stop or restart the clock; phases sleep while it is stopped."""
+        self._paused = not self._paused
+        self._game.wake_threads()
+
+    def __str__(self):
+        return self.face.text(self._value)
+
+
+# Toggles Phase
+class Toggles(PhaseThread):
+    max_interval = 0.4  # Switches stay put, so a slow poll cannot miss them
+
+    def __init__(self, pins, game, rng=random, name="Toggles"):
+        super().__init__(game, name)
+        self._value = ""  # Last settled state, pin 0 first
+        self._pins = pins
+        self._settle = game.config.toggle_settle
+        self._attempts = game.config.attempt_events
+        self._raw = None
+        self._raw_since = 0.0
+        self._settled = None
+        self._solution, self._math_problem = generate_toggles(
+            rng, game.config.toggle_problems
+        )
+
+    def poll(self):
+        now = monotonic()
+        raw = read_bitmask(self._pins)
+        if raw != self._raw:
+            self._raw, self._raw_since = raw, now
+            values = tuple(raw >> i & 1 for i in range(len(self._pins)))
+            self._game.emit("inputs", phase=self.name, values=values)
+            return True
+        if raw == self._settled:
+            return False
+        if now - self._raw_since < self._settle:
+            return True  # Mid-flip or bouncing; look again soon
+
+        # The switches have held still: judge this state, once
+        self._settled = raw
+        self._value = "".join(str(raw >> i & 1) for i in range(len(self._pins)))
+        correct = self._value == self._solution
+        if self._attempts:
+            self._game.emit(
+                "attempt", phase=self.name, value=self._value, correct=correct
+            )
+        if correct:
+            self.solve()
+        return True
+
+
+class Button(PhaseThread):
+    urgent = 60  # Seconds left below which the LED pulses red, faster and faster
+    flash = 0.5  # Seconds the LED shows red after a wrong answer anywhere
+
+    def __init__(self, state, rgb, game, name="Button"):
+        super().__init__(game, name)
+        self._state = state
+        self._rgb = rgb
+        # The LED is driven from this thread, between polls of the button
+        self.led = RgbLed(rgb) if rgb else None
+        self._flash_until = 0.0
+        if self.led is not None:
+            game.subscribe(self._on_game_event)
+
+    def _on_game_event(self, event, **data):
+        if event == "penalty":
+            self._flash_until = monotonic() + self.flash
+            self.wake()
+
+    def poll(self):
+        if self._state.value:
+            self.solve()
+            return True
+        return False
+
+    def pattern(self, now):
+        """The LED colour for the moment `now`, while the button is being played."""
+        if now < self._flash_until:
+            return RED
+        remaining = self._game.timer._value
+        if remaining < self.urgent:
+            return pulse(RED, 1 + 3 * (1 - remaining / self.urgent), now)
+        return blink(BLUE, 1, now)  # Press me
+
+    def run(self):
+        if self.led is None:
+            super().run()
+            return
+        # The button is polled once per LED pattern step: every `interval`
+        # while it is played, as a plain phase would be, with the PWM edges
+        # of that step slept through in between
+        while self._running:
+            if self._game.timer._paused:
+                self.led.hold(OFF)
+                self._sleep("paused")
+                continue
+            self.poll()
+            now = monotonic()
+            if self._game.is_live(self):
+                self.led.show(self.pattern(now), now + self.interval, self._sleep_until)
+            elif now < self._flash_until:
+                self.led.show(RED, self._flash_until, self._sleep_until)
+            else:
+                self.led.hold(OFF)
+                self._sleep("waiting", self.idle_interval)
+        self.led.hold(GREEN if self._solved else OFF)
+
+    def _sleep_until(self, deadline):
+        """Sleep to a PWM deadline, through wakeups, unless the phase stops."""
+        while self._running:
+            left = deadline - monotonic()
+            if left <= 0:
+                return
+            self._sleep("pwm", left)
+
+
+# Keypad Phase
+class Keypad(PhaseThread):
+    def __init__(self, keypad, game, rng=random, name="Keypad"):
+        super().__init__(game, name)
+        self._keypad = keypad
+        self._value = ""
+        self._equation, self._solution = generate_keypad(rng, game.config.keypad_table)
+        self._held = False
+
+    def poll(self):
+        pressed = self._keypad.pressed_keys
+        # A key counts once when it goes down, however long it is held
+        if not pressed or self._held:
+            changed = self._held != bool(pressed)
+            self._held = bool(pressed)
+            return changed
+        self._held = True
+        key = pressed[0]
+
+        if key == "#":
+            self._value = self._value[:-1]
+        elif key == "*":
+            if self._value and int(self._value) == self._solution:
+                self.solve()
+                return True
+            self._value = ""
+            self._game.penalize(self)
+        elif len(self._value) < 4:
+            self._value += str(key)
+        self._game.emit("inputs", phase=self.name, values=self._value)
+        return True
+
+
+# Wires Phase
+class Wires(PhaseThread):
+    max_interval = 0.4  # A cut wire stays cut
+
+    def __init__(self, pins, game, rng=random, name="Wires"):
+        super().__init__(game, name)
+        self._pins = pins
+        self._debounce = game.config.wire_debounce
+        # Intact wires read high; each line only changes state in _stable
+        # once its raw reading has held for the debounce time
+        self._raw = self._stable = (1 << len(pins)) - 1
+        self._raw_since = [0.0] * len(pins)
+        # The question bank is the config's, shared by every game
+        self._current_question = choose_wires_question(rng, game.config.wires_questions)
+        self._cut_wires = set()  # Track which wires have been cut
+
+    def poll(self):
+        now = monotonic()
+        raw = read_bitmask(self._pins)
+        flipped = raw ^ self._raw
+        if flipped:
+            self._raw = raw
+            while flipped:
+                bit = flipped & -flipped
+                self._raw_since[bit.bit_length() - 1] = now
+                flipped ^= bit
+        pending = self._raw ^ self._stable
+        if not pending:
+            return False
+        settled = 0
+        while pending:
+            bit = pending & -pending
+            if now - self._raw_since[bit.bit_length() - 1] >= self._debounce:
+                settled |= bit
+            pending ^= bit
+        if settled:
+            self._stable ^= settled
+            values = tuple(bool(self._stable >> i & 1) for i in range(len(self._pins)))
+            self._game.emit("inputs", phase=self.name, values=values)
+            cut = settled & ~self._stable
+            while cut:
+                bit = cut & -cut
+                cut ^= bit
+                if self._wire_cut(chr(64 + bit.bit_length())):
+                    return True
+        return True  # Lines still settling want a quick recheck
+
+    def _wire_cut(self, wire):
+        """A wire has read cut for the debounce time; returns True if solved."""
+        if wire in self._cut_wires:
+            return False  # Reconnected and cut again: it only counts once
+        self._cut_wires.add(wire)
+        self._game.emit("cut", phase=self.name, wire=wire, time=time())
+        if wire == self._current_question["correct"]:
+            self.solve()
+            return True
+        self._game.penalize(self)
+        return False
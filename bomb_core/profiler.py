@@ -0,0 +1,155 @@
+"""
+On-demand sampling profiler for a running station.
+
+A profile samples the stack of every thread -- the Qt GUI thread, the timer
+and each phase -- for a few seconds and writes them in collapsed-stack form,
+one "thread;outer;...;inner count" line per distinct stack, ready for
+flamegraph.pl or speedscope.  A summary of where each thread spent its time
+(InputDisplay repaints, I2C and GPIO, phase polling, sleeping) is printed
+when the profile finishes.
+
+Start one with SIGUSR1 (kill -USR1 <pid>), Ctrl+Shift+P in the GUI, or by
+setting BOMB_PROFILE=<seconds> to profile from launch.
+"""
+import os
+import signal
+import sys
+import threading
+from threading import Thread
+from time import monotonic, sleep, strftime
+
+DEFAULT_DURATION = 10.0
+
+LIBRARIES = ("adafruit_", "busio", "digitalio", "board")  # The I2C and GPIO stack
+# (category, test on a frame label), checked innermost frame outwards
+CATEGORIES = (
+    ("I2C/GPIO", lambda label: label.startswith(LIBRARIES)),
+    ("InputDisplay", lambda label: ":InputDisplay." in label),
+    ("polling", lambda label: label.startswith("phases.py:") and label.endswith(".poll")),
+)
+SLEEPING = ("threading.py:Event.wait", "threading.py:Condition.wait")
+
+_lock = threading.Lock()
+_active = None
+
+
+def frame_label(frame):
+    """'file.py:Qualified.name' for a frame; installed libraries keep their package."""
+    code = frame.f_code
+    _, found, filename = code.co_filename.rpartition("site-packages" + os.sep)
+    if not found:
+        filename = os.path.basename(code.co_filename)
+    return f"{filename}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+def categorize(stack):
+    """Where a sampled stack (outermost frame first) was spending its time."""
+    if stack and stack[-1] in SLEEPING:
+        return "sleeping"
+    for label in reversed(stack):
+        for category, test in CATEGORIES:
+            if test(label):
+                return category
+    return "other"
+
+
+class SamplingProfiler(Thread):
+    def __init__(
+        self, duration=DEFAULT_DURATION, interval=0.01, path=None, name="Profiler"
+    ):
+        """
+        Samples every thread's stack for `duration` seconds, then writes them.
+
+        Args:
+            duration (float): Seconds to profile for.
+            interval (float): Seconds between samples.
+            path (str): Collapsed-stack output file; timestamped in the
+                working directory by default.
+            name (str): Thread name.
+        """
+        super().__init__(name=name, daemon=True)
+        self.duration = duration
+        self.interval = interval
+        self.path = path or f"profile-{strftime('%Y%m%d-%H%M%S')}.folded"
+        self.stacks = {}  # (thread name, frame labels...) -> samples
+        self.samples = 0
+
+    def sample(self):
+        """Take one sample of every other thread's stack."""
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == self.ident:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(frame_label(frame))
+                frame = frame.f_back
+            stack.append(names.get(ident, f"thread-{ident}"))
+            key = tuple(reversed(stack))
+            self.stacks[key] = self.stacks.get(key, 0) + 1
+        self.samples += 1
+
+    def run(self):
+        global _active
+        end = monotonic() + self.duration
+        try:
+            while monotonic() < end:
+                self.sample()
+                sleep(self.interval)
+            self.write()
+            print(self.summary(), file=sys.stderr, flush=True)
+        finally:
+            with _lock:
+                _active = None
+
+    def write(self):
+        with open(self.path, "w") as f:
+            for stack, count in sorted(self.stacks.items()):
+                f.write(f"{';'.join(stack)} {count}\n")
+
+    def summary(self):
+        """Per-thread breakdown of the samples by category."""
+        threads = {}
+        for stack, count in self.stacks.items():
+            categories = threads.setdefault(stack[0], {})
+            category = categorize(stack[1:])
+            categories[category] = categories.get(category, 0) + count
+        lines = [f"profile: {self.samples} samples over {self.duration:g}s -> {self.path}"]
+        for thread, categories in sorted(threads.items()):
+            total = sum(categories.values())
+            shares = ", ".join(
+                f"{category} {count / total:.0%}"
+                for category, count in sorted(categories.items(), key=lambda c: -c[1])
+            )
+            lines.append(f"  {thread:<16} {shares}")
+        return "\n".join(lines)
+
+
+def start_profiling(duration=DEFAULT_DURATION):
+    """
+    Start a profile unless one is already running.
+
+    Returns:
+        SamplingProfiler: The new profile, or None if one was running.
+    """
+    global _active
+    with _lock:
+        if _active is not None:
+            return None
+        profiler = _active = SamplingProfiler(duration)
+    print(f"Profiling for {duration:g}s", file=sys.stderr, flush=True)
+    profiler.start()
+    return profiler
+
+
+def install_triggers():
+    """
+    Profile on SIGUSR1, and from now if BOMB_PROFILE is set.
+
+    Call from the main thread; the GUI adds its own key combination.
+    """
+    if hasattr(signal, "SIGUSR1"):
+        signal.signal(signal.SIGUSR1, lambda signum, frame: start_profiling())
+    duration = os.environ.get("BOMB_PROFILE")
+    if duration:
+        start_profiling(float(duration))
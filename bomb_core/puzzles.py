@@ -0,0 +1,146 @@
+"""
+Puzzle generators and penalty rules shared by the game and its tools.
+
+Everything that decides what a player has to solve, and what a mistake costs,
+lives here so the GUIs, the simulator and any other tooling stay in sync.
+"""
+import random
+from bisect import bisect_right
+
+# Constants
+COUNTDOWN = 300
+PENALTY_TIME = 30  # Time penalty for wrong answers
+# The phases a station plays, in order
+PHASE_ORDER = ("Toggles", "Button", "Keypad", "Wires")
+# Phases whose wrong answers cost PENALTY_TIME (a bad toggle only costs time)
+PENALIZED_PHASES = ("Keypad", "Wires")
+
+TOGGLE_PROBLEMS = (
+    ("2 ** 3 + 3", 2**3 + 3),
+    ("4 * 3 - 2", 4 * 3 - 2),
+    ("5 + 2 ** 2", 5 + 2**2),
+)
+
+WIRES_QUESTIONS = (
+    {
+        "question": "What year was the University of Tampa founded?",
+        "choices": ["A. 1940", "B. 1931", "C. 1933", "D. 1924", "E. 2005"],
+        "correct": "B",
+    },
+    {
+        "question": "What was the first cause of a computer bug?",
+        "choices": [
+            "A. Syntax error",
+            "B. Logic error",
+            "C. Server crash",
+            "D. A real life bug",
+            "E. None",
+        ],
+        "correct": "D",
+    },
+    {
+        "question": "First school with a computer science program?",
+        "choices": [
+            "A. Harvard",
+            "B. UPenn",
+            "C. Princeton",
+            "D. MIT",
+            "E. Cambridge",
+        ],
+        "correct": "E",
+    },
+    {
+        "question": "Who is considered the first programmer?",
+        "choices": [
+            "A. Rohan Khanad",
+            "B. Murot Yildiz",
+            "C. Ada Lovelace",
+            "D. Dr. Kancharla",
+            "E. Ricardo",
+        ],
+        "correct": "C",
+    },
+)
+
+
+def apply_penalty(value, penalty=PENALTY_TIME):
+    """
+    Apply a wrong-answer penalty to a countdown value.
+
+    Args:
+        value (int): Seconds left on the clock.
+        penalty (int): Seconds to take off.
+
+    Returns:
+        int: The new countdown value, never below zero.
+    """
+    return max(0, value - penalty)
+
+
+def generate_toggles(rng=random, problems=TOGGLE_PROBLEMS):
+    """
+    Pick a toggles math problem.
+
+    Args:
+        rng (Random): Source of randomness.
+        problems (tuple): (problem text, answer) pairs to pick from.
+
+    Returns:
+        tuple: (4-bit binary solution string, problem text).
+    """
+    problem, answer = rng.choice(problems)
+    return format(answer, "04b"), problem
+
+
+def keypad_table(max_operand=255, min_product=1000, max_product=9999):
+    """
+    Tabulate every keypad puzzle a difficulty allows, for generate_keypad.
+
+    Each row covers one first operand: (puzzles up to and including this row,
+    first operand, smallest second operand).  The second operands of a row
+    are consecutive, so the table stays small however many puzzles there are.
+
+    Returns:
+        tuple: The rows, empty if no operands fit.
+    """
+    rows = []
+    total = 0
+    for num1 in range(1, max_operand + 1):
+        low = max(1, -(-min_product // num1))
+        high = min(max_operand, max_product // num1)
+        if low <= high:
+            total += high - low + 1
+            rows.append((total, num1, low))
+    return tuple(rows)
+
+
+def generate_keypad(rng=random, table=None):
+    """
+    Pick two binary operands whose product has four decimal digits.
+
+    Args:
+        rng (Random): Source of randomness.
+        table (tuple): A keypad_table to pick from in one draw, with every
+            puzzle in it equally likely.  By default operands are drawn until
+            their product fits.
+
+    Returns:
+        tuple: ((num1, num2) as binary strings, decimal product).
+    """
+    if table:
+        index = rng.randrange(table[-1][0])
+        row = bisect_right(table, (index, float("inf"), 0))
+        end, num1, low = table[row]
+        num2 = low + index - (table[row - 1][0] if row else 0)
+        return (bin(num1)[2:], bin(num2)[2:]), num1 * num2
+    while True:
+        num1 = bin(rng.randint(1, 255))[2:]
+        num2 = bin(rng.randint(1, 255))[2:]
+        decimal_result = int(num1, 2) * int(num2, 2)
+        if 1000 <= decimal_result <= 9999:
+            return (num1, num2), decimal_result
+
+
+def choose_wires_question(rng=random, questions=WIRES_QUESTIONS):
+    """Pick a wires trivia question from `questions`."""
+    return rng.choice(questions)
@@ -0,0 +1,604 @@
+"""
+PyQt6 frontend for the game core.
+
+The window subscribes to a Game and renders what it reports; it owns no game
+logic, timers or input polling of its own.
+"""
+import os
+import queue
+
+from PyQt6.QtWidgets import (
+    QApplication,
+    QMainWindow,
+    QVBoxLayout,
+    QGridLayout,
+    QLabel,
+    QWidget,
+    QProgressBar,
+)
+from PyQt6.QtCore import QPointF, QRectF, QSize, Qt, QTimer
+from PyQt6.QtGui import (
+    QColor,
+    QKeySequence,
+    QPainter,
+    QPen,
+    QShortcut,
+    QStaticText,
+)
+from PyQt6.QtWidgets import QSizePolicy
+
+from bomb_core.profiler import start_profiling
+from bomb_core.render import RenderScheduler
+from bomb_core.theme import current_theme, make_font
+
+
+class InputDisplay(QWidget):
+    def __init__(
+        self,
+        num_pins,
+        size=50,
+        font_size=24,
+        border_color_active="#00FF00",
+        border_color_inactive="#FF0000",
+        parent=None,
+    ):
+        """
+        A customizable display for binary input pins.
+
+        The pins are circles painted by this one widget with pens and fills
+        chosen up front, so a pin changing state is a repaint, not a restyle.
+
+        Args:
+            num_pins (int): Number of input pins to display.
+            size (int): Size of the circles' text area (width and height).
+            font_size (int): Font size for the labels.
+            border_color_active (str): Border color when the pin is active (1).
+            border_color_inactive (str): Border color when the pin is inactive (0).
+            parent (QWidget): Parent widget.
+        """
+        super().__init__(parent)
+        self.num_pins = num_pins
+        self.size = size
+        self.font_size = font_size
+        self.values = [""] * num_pins
+        self._active = [False] * num_pins
+        theme = current_theme()
+        self._font = make_font(font_size)
+        # Active -> (border and text pen, fill)
+        self._looks = {
+            True: (QPen(QColor(border_color_active), 3), theme.surface),
+            False: (QPen(QColor(border_color_inactive), 3), theme.background),
+        }
+        self._diameter = size + 16  # Padding and border around the text area
+        self._spacing = 6
+
+    def sizeHint(self):
+        width = self.num_pins * (self._diameter + self._spacing) - self._spacing
+        return QSize(width + 2 * self._spacing, self._diameter + 2 * self._spacing)
+
+    def minimumSizeHint(self):
+        return self.sizeHint()
+
+    def update_values(self, pin_values):
+        """
+        Update the display to reflect the current pin values.
+
+        Args:
+            pin_values (list): List of pin values (1 or 0).
+        """
+        changed = False
+        for i, value in enumerate(pin_values):
+            if self.values[i] != str(value):
+                self.values[i] = str(value)
+                self._active[i] = bool(value)
+                changed = True
+        if changed:
+            self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setFont(self._font)
+        step = self._diameter + self._spacing
+        x = (self.width() - self.num_pins * step + self._spacing) / 2
+        y = (self.height() - self._diameter) / 2
+        for text, active in zip(self.values, self._active):
+            pen, fill = self._looks[active]
+            circle = QRectF(x + 1.5, y + 1.5, self._diameter - 3, self._diameter - 3)
+            painter.setPen(pen)
+            painter.setBrush(fill)
+            painter.drawEllipse(circle)
+            painter.drawText(circle, Qt.AlignmentFlag.AlignCenter, text)
+            x += step
+        painter.end()
+
+
+class ChoicePanel(QWidget):
+    def __init__(
+        self,
+        question_size=18,
+        choice_size=12,
+        padding=8,
+        parent=None,
+    ):
+        """
+        A question over a boxed list of choices, painted from static text.
+
+        The text is laid out once per question, in set_question(); painting
+        only draws the prepared QStaticText, and nothing asks for a repaint
+        while the question stays up.
+
+        Args:
+            question_size (int): Pixel size of the question's font.
+            choice_size (int): Pixel size of the choices' font.
+            padding (int): Pixels between the box and its text, and between
+                the question and the box.
+            parent (QWidget): Parent widget.
+        """
+        super().__init__(parent)
+        theme = current_theme()
+        self._question_font = make_font(question_size)
+        self._choice_font = make_font(choice_size)
+        self._pen = QPen(theme.colours["normal"])
+        self._background = theme.surface
+        self._padding = padding
+        self._shown = None
+        self._question = None
+        self._choices = []  # (QStaticText, y offset within the box)
+        self._question_size = QSize()
+        self._box_size = QSize()
+        self.paints = 0
+        self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+
+    def _prepare(self, text, font):
+        static = QStaticText(text)
+        static.setTextFormat(Qt.TextFormat.PlainText)
+        static.setPerformanceHint(QStaticText.PerformanceHint.AggressiveCaching)
+        static.prepare(font=font)
+        return static
+
+    def set_question(self, question, choices):
+        """Lay out a new question and its choices; the same one is a no-op."""
+        shown = (question, tuple(choices))
+        if shown == self._shown:
+            return
+        self._shown = shown
+        self._question = self._prepare(question, self._question_font)
+        size = self._question.size()
+        self._question_size = QSize(int(size.width()) + 1, int(size.height()) + 1)
+        self._choices = []
+        y = width = 0.0
+        for choice in choices:
+            static = self._prepare(choice, self._choice_font)
+            self._choices.append((static, y))
+            y += static.size().height()
+            width = max(width, static.size().width())
+        self._box_size = QSize(
+            int(width) + 1 + 2 * self._padding, int(y) + 1 + 2 * self._padding
+        )
+        self.updateGeometry()
+        self.update()
+
+    def sizeHint(self):
+        return QSize(
+            max(self._question_size.width(), self._box_size.width()),
+            self._question_size.height() + self._padding + self._box_size.height(),
+        )
+
+    def minimumSizeHint(self):
+        return self.sizeHint()
+
+    def paintEvent(self, event):
+        self.paints += 1
+        if self._question is None:
+            return
+        painter = QPainter(self)
+        painter.setPen(self._pen)
+        width = self.width()
+        painter.setFont(self._question_font)
+        painter.drawStaticText(
+            QPointF((width - self._question_size.width()) / 2, 0), self._question
+        )
+        top = self._question_size.height() + self._padding
+        box = QRectF(0.5, top + 0.5, width - 1, self._box_size.height() - 1)
+        painter.fillRect(box, self._background)
+        painter.drawRect(box)
+        painter.setFont(self._choice_font)
+        x = self._padding
+        for static, y in self._choices:
+            painter.drawStaticText(QPointF(x, top + self._padding + y), static)
+        painter.end()
+
+
+# (text, theme font role, theme state) shown on the phase status label
+UNSOLVED_STATUS = ("Unsolved", "status", "unsolved")
+SOLVED_STATUS = ("Solved", "strong_status", "solved")
+PENALTY_STATUS = (
+    "Wrong! -{}s penalty",  # Formatted with the game's penalty
+    "penalty",
+    "wrong",
+)
+
+
+# Modern Bomb Defusal GUI
+class ModernBombDefusalGUI(QMainWindow):
+    def __init__(self, game, fullscreen=True, on_reset=None):
+        """
+        Main window showing one game.
+
+        Args:
+            game (Game): The game to display.
+            fullscreen (bool): Open maximized, as on the station display.
+            on_reset (callable): Called on the GUI thread with the new seed
+                when an operator resets the game, to replace the game and
+                this window.
+        """
+        super().__init__()
+        self.setWindowTitle("Bomb Defusal Simulator")
+        # Colours and fonts are palettes and fonts built once by the theme;
+        # nothing in the window is styled by a stylesheet that cascades
+        self.theme = theme = current_theme()
+        theme.window(self)
+        if fullscreen:
+            self.showMaximized()  # This makes the window fullscreen
+
+        # Layout Setup
+        central_widget = QWidget()
+        central_widget.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+        main_layout = QVBoxLayout()
+        main_layout.setContentsMargins(20, 20, 20, 20)  # Left, Top, Right, Bottom margins
+        main_layout.setSpacing(20)  # Spacing between widgets
+        central_widget.setLayout(main_layout)
+        self.setCentralWidget(central_widget)
+
+        # Phase Label
+        self.phase_label = QLabel("")
+        self.phase_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        theme.style(self.phase_label, "phase")
+        main_layout.addWidget(self.phase_label)
+
+        # Timer
+        self.timer_label = QLabel(f"Time Remaining: {game.timer}")
+        self.timer_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        theme.style(self.timer_label, "timer")
+        main_layout.addWidget(self.timer_label)
+
+        self.time_progress = QProgressBar()
+        # For the progress bar, make it expand horizontally
+        self.time_progress.setMinimumWidth(400)
+        self.time_progress.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
+        # Its border is the one rule a palette cannot set; this stylesheet
+        # covers only the bar and is never changed
+        self.time_progress.setStyleSheet(
+            "QProgressBar { border: 2px solid #00FF00; border-radius: 5px; text-align: center; }"
+            " QProgressBar::chunk { background-color: #00FF00; }"
+        )
+        # The full countdown, so a resumed game's bar starts part-way down
+        self.time_progress.setMaximum(game.countdown)
+        self.time_progress.setValue(game.timer._value)
+        main_layout.addWidget(self.time_progress)
+
+        # Phases Layout
+        phases_layout = QVBoxLayout()
+        phases_layout.setContentsMargins(20, 20, 20, 20)
+        phases_layout.setSpacing(20)
+        main_layout.addLayout(phases_layout)
+
+        # Toggles Section
+        toggles_widget = QWidget()
+        toggles_layout = QVBoxLayout()
+        toggles_widget.setLayout(toggles_layout)
+        self.toggles_question = QLabel("")
+        self.toggles_question.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        theme.style(self.toggles_question, "question")
+        toggles_layout.addWidget(self.toggles_question)
+        self.toggle_input_display = InputDisplay(
+            num_pins=4,
+            size=100,  # Larger size
+            font_size=24,  # Smaller font size
+            border_color_active="#00FF00",  # Green for active
+            border_color_inactive="#FF0000",  # Red for inactive
+        )
+        toggles_layout.addWidget(self.toggle_input_display)
+        phases_layout.addWidget(toggles_widget, alignment=Qt.AlignmentFlag.AlignCenter)
+
+        # Button Section
+        button_widget = QWidget()
+        button_layout = QVBoxLayout()
+        button_widget.setLayout(button_layout)
+        # Button instruction label
+        self.button_instruction = QLabel("Press the button")
+        self.button_instruction.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        theme.style(self.button_instruction, "question")
+        button_layout.addWidget(self.button_instruction)
+        phases_layout.addWidget(button_widget, alignment=Qt.AlignmentFlag.AlignCenter)
+
+        # Keypad Section
+        keypad_widget = QWidget()
+        keypad_layout = QVBoxLayout()
+        keypad_widget.setLayout(keypad_layout)
+        self.keypad_equation = QLabel("")
+        self.keypad_equation.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        theme.style(self.keypad_equation, "question")
+        keypad_layout.addWidget(self.keypad_equation)
+        self.keypad_input_display = InputDisplay(
+            num_pins=4,
+            size=40,  # Smaller size
+            font_size=18,  # Smaller font size
+            border_color_active="#00FF00",  # Green for active
+            border_color_inactive="#FF0000",  # Red for inactive
+        )
+        keypad_layout.addWidget(self.keypad_input_display)
+        phases_layout.addWidget(keypad_widget, alignment=Qt.AlignmentFlag.AlignCenter)
+
+        # Wires Section
+        wires_widget = QWidget()
+        wires_layout = QVBoxLayout()
+        wires_widget.setLayout(wires_layout)
+        # Laid out once per question, and never repainted while it is up
+        self.wires_panel = ChoicePanel()
+        wires_layout.addWidget(self.wires_panel)
+        phases_layout.addWidget(wires_widget, alignment=Qt.AlignmentFlag.AlignCenter)
+
+        # Phase Status
+        self.phase_status = QLabel("Unsolved")
+        self.phase_status.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        theme.style(self.phase_status, "status", "unsolved")
+        main_layout.addWidget(self.phase_status)
+
+        # Game Status
+        self.game_status = QLabel("Status: Normal")
+        self.game_status.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        theme.style(self.game_status, "game_status")
+        main_layout.addWidget(self.game_status)
+
+        # One container per phase, shown only while it is played; showing or
+        # hiding a whole phase is one call rather than one per widget
+        self.sections = {
+            "Toggles": toggles_widget,
+            "Button": button_widget,
+            "Keypad": keypad_widget,
+            "Wires": wires_widget,
+        }
+
+        # Widget refresh, capped to the render frame rate
+        self.render = RenderScheduler(max_fps=int(os.environ.get("BOMB_MAX_FPS", 20)))
+        self.render.register("timer", self.show_time)
+        self.render.register("phase_status", self.show_phase_status)
+        self.render.register("Toggles", self.toggle_input_display.update_values)
+        self.render.register("Keypad", self.show_keypad_value)
+        self.render_timer = QTimer(self)
+        self.render_timer.timeout.connect(self.render.flush)
+        self.render_timer.start(self.render.interval_ms)
+        if os.environ.get("BOMB_RENDER_STATS"):
+            self.render_stats = QTimer(self)
+            self.render_stats.timeout.connect(lambda: print(self.render.report()))
+            self.render_stats.start(5000)
+
+        # Profile every thread for a few seconds, for a sluggish station
+        self.profile_shortcut = QShortcut(QKeySequence("Ctrl+Shift+P"), self)
+        self.profile_shortcut.activated.connect(start_profiling)
+
+        # Assign Game Logic; its events arrive on game threads and are
+        # handed over to the GUI thread through a queue
+        self.game = game
+        self._on_reset = on_reset
+        self._events = queue.SimpleQueue()
+        self.game.subscribe(self.on_game_event)
+
+        # Timer Update
+        self.timer_updater = QTimer(self)
+        self.timer_updater.timeout.connect(self.update_game_state)
+        self.timer_updater.start(100)
+
+        # For individual section layouts
+        toggles_layout.setContentsMargins(10, 10, 10, 10)
+        button_layout.setContentsMargins(10, 10, 10, 10)
+        keypad_layout.setContentsMargins(10, 10, 10, 10)
+        wires_layout.setContentsMargins(10, 10, 10, 10)
+
+    def on_game_event(self, event, **data):
+        """Game subscriber; runs on game threads, so only queues the event."""
+        self._events.put((event, data))
+
+    def update_game_state(self):
+        """Apply the events the game reported since the last update."""
+        while True:
+            try:
+                event, data = self._events.get_nowait()
+            except queue.Empty:
+                return
+            if event == "tick":
+                self.render.post("timer", data["value"])
+            elif event == "inputs":
+                self.render.post(data["phase"], data["values"])  # If shown
+            elif event == "penalty":
+                text, role, state = PENALTY_STATUS
+                self.render.post(
+                    "phase_status", (text.format(self.game.config.penalty), role, state)
+                )
+                self.render.post("timer", data["value"])
+            elif event == "solved":
+                self.render.post("phase_status", SOLVED_STATUS)
+                self.render.flush()
+                QApplication.processEvents()  # Ensure GUI updates before the delay
+                if data["next"] <= len(self.game.phases):
+                    QTimer.singleShot(1000, self.load_next_phase)
+            elif event == "defused":
+                # BOMB DEFUSED
+                QTimer.singleShot(1000, self.end_game)
+                return
+            elif event == "exploded":
+                self.signal_game_over()
+                return
+            elif event == "reset":
+                self.timer_updater.stop()
+                if self._on_reset is not None:
+                    self._on_reset(data["seed"])
+                return
+
+    def show_time(self, value):
+        """Show the seconds left on the timer label and progress bar."""
+        self.timer_label.setText(f"Time Remaining: {self.game.timer.face.text(value)}")
+        self.time_progress.setValue(value)
+
+    def show_phase_status(self, status):
+        """Show a (text, font role, state) status on the phase status label."""
+        text, role, state = status
+        self.phase_status.setText(text)
+        self.theme.style(self.phase_status, role, state)
+
+    def show_keypad_value(self, value):
+        """Show the digits entered so far, padded to the four display slots."""
+        self.keypad_input_display.update_values(value + " " * (4 - len(value)))
+
+    def load_next_phase(self):
+        """Update UI when transitioning to a new phase."""
+        self.render.post("phase_status", UNSOLVED_STATUS)
+        self.update_phase_ui()
+
+    def update_phase_ui(self):
+        """Set up the UI for the phase being played, or every live module."""
+        phase = self.game.current()
+        if phase is None:
+            return
+        if self.game.parallel:
+            live = [phase for phase in self.game.phases if not phase._solved]
+            solved = len(self.game.phases) - len(live)
+            self.phase_label.setText(f"Modules: {solved}/{len(self.game.phases)} solved")
+        else:
+            live = [phase]
+            self.phase_label.setText(
+                f"Phase: {self.game.state.check_phase()} - {phase.name}"
+            )
+        for phase in live:
+            self.fill_section(phase)
+        shown = {phase.name for phase in live}
+        for name, section in self.sections.items():
+            if section.isHidden() == (name in shown):
+                section.setVisible(name in shown)
+
+    def fill_section(self, phase):
+        """Put a phase's puzzle on its section."""
+        if phase.name == "Toggles":
+            self.toggles_question.setText(f"Solve: {phase._math_problem}\n")
+        elif phase.name == "Keypad":
+            self.keypad_equation.setText(
+                f"Multiply: {phase._equation[0]} x {phase._equation[1]}"
+            )
+        elif phase.name == "Wires":
+            question = phase._current_question
+            self.wires_panel.set_question(question["question"], question["choices"])
+
+    def hide_phases(self):
+        for section in self.sections.values():
+            section.hide()
+
+    def end_game(self):
+        """The user has successfully defused the bomb"""
+        self.hide_phases()
+        self.phase_label.setText("BOMB DEFUSED!")
+        self.theme.style(self.phase_label, "headline", "defused")
+        self.phase_status.hide()
+        self.time_progress.hide()
+        self.game_status.hide()
+        self.timer_updater.setInterval(500)  # Only an operator reset can follow
+
+    def signal_game_over(self):
+        self.hide_phases()
+        self.phase_label.setText("BOMB EXPLODED!")
+        self.theme.style(self.phase_label, "headline", "exploded")
+        self.phase_status.hide()
+        self.time_progress.hide()
+        self.render.post("timer", 0)
+        self.theme.colour(self.timer_label, "exploded")
+        self.game_status.hide()
+        self.timer_updater.setInterval(500)
+
+    # Any touch on the screen wakes an idle game
+    def mousePressEvent(self, event):
+        self.game.wake()
+        super().mousePressEvent(event)
+
+    def keyPressEvent(self, event):
+        self.game.wake()
+        super().keyPressEvent(event)
+
+    def closeEvent(self, event):
+        self.game.unsubscribe(self.on_game_event)
+        super().closeEvent(event)
+
+
+class ArenaDashboard(QWidget):
+    def __init__(self, games, max_fps=5, parent=None):
+        """
+        Tiled overview of many games, one tile per station.
+
+        Every tile shares one render scheduler and one refresh timer, so the
+        dashboard costs the same number of timers however many stations run.
+
+        Args:
+            games (list): The games to show.
+            max_fps (int): Cap on tile refreshes per second.
+            parent (QWidget): Parent widget.
+        """
+        super().__init__(parent)
+        self.setWindowTitle("Bomb Defusal Arena")
+        theme = current_theme()
+        theme.window(self)
+        self.render = RenderScheduler(max_fps)
+        layout = QGridLayout()
+        self.setLayout(layout)
+        columns = max(1, round(len(games) ** 0.5))
+
+        for i, game in enumerate(games):
+            tile = QVBoxLayout()
+            title = QLabel(f"Station {i + 1}")
+            theme.style(title, "tile_title")
+            time_label = QLabel()
+            theme.style(time_label, "timer")
+            phase_label = QLabel()
+            for label in (title, time_label, phase_label):
+                label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+                tile.addWidget(label)
+            layout.addLayout(tile, i // columns, i % columns)
+
+            self.render.register(
+                (i, "time"),
+                lambda value, label=time_label, face=game.timer.face: label.setText(
+                    face.text(value)
+                ),
+            )
+            self.render.register((i, "phase"), lambda value, label=phase_label: label.setText(value))
+            self.render.register(
+                (i, "state"),
+                lambda state, label=time_label: theme.colour(label, state),
+            )
+            self.render.post((i, "time"), game.timer._value)
+            self.render.post((i, "phase"), self.phase_text(game))
+            game.subscribe(lambda event, i=i, game=game, **data: self.on_game_event(i, game, event, data))
+
+        self.render_timer = QTimer(self)
+        self.render_timer.timeout.connect(self.render.flush)
+        self.render_timer.start(self.render.interval_ms)
+
+    @staticmethod
+    def phase_text(game):
+        phase = game.current()
+        if phase is None:
+            return ""
+        if game.parallel:
+            return f"{game.state.check_phase() - 1}/{len(game.phases)} modules solved"
+        return f"Phase {game.state.check_phase()} - {phase.name}"
+
+    def on_game_event(self, i, game, event, data):
+        """Game subscriber; only posts, so it is safe on game threads."""
+        if event in ("tick", "penalty"):
+            self.render.post((i, "time"), data["value"])
+        elif event == "solved":
+            self.render.post((i, "phase"), self.phase_text(game))
+        elif event == "defused":
+            self.render.post((i, "phase"), "DEFUSED")
+        elif event == "exploded":
+            self.render.post((i, "phase"), "EXPLODED")
+            self.render.post((i, "state"), "exploded")
@@ -0,0 +1,83 @@
+"""
+Frame-budgeted widget refresh.
+
+Game threads and GUI timers post the value a widget should show; the GUI
+thread applies the latest value of each dirty widget once per frame.  Widgets
+whose value did not change are never touched, so nothing repaints between
+frames or when the displayed value is the same.
+"""
+import threading
+from time import thread_time
+
+
+class RenderScheduler:
+    def __init__(self, max_fps=20):
+        """
+        Tracks the dirty state of each registered widget.
+
+        post() may be called from any thread.  flush() must be called from the
+        GUI thread, typically from a timer firing every `interval_ms`.
+
+        Args:
+            max_fps (int): Cap on how many times per second widgets are updated.
+        """
+        self.max_fps = max_fps
+        self._lock = threading.Lock()
+        self._setters = {}
+        self._shown = {}
+        self._pending = {}
+        self.posts = 0
+        self.frames = 0
+        self.repaints = 0
+        self.cpu_time = 0.0
+
+    @property
+    def interval_ms(self):
+        return max(1, round(1000 / self.max_fps))
+
+    def register(self, key, setter):
+        """
+        Register a widget update.
+
+        Args:
+            key (str): Name the value is posted under.
+            setter (callable): Called on the GUI thread with the new value.
+        """
+        self._setters[key] = setter
+
+    def post(self, key, value):
+        """
+        Ask for `key` to show `value` on the next frame.
+
+        A key with no registered setter is nothing this GUI shows, and its
+        value is dropped.
+        """
+        if key not in self._setters:
+            return
+        with self._lock:
+            self._pending[key] = value
+            self.posts += 1
+
+    def flush(self):
+        """Apply every pending value that differs from what is on screen."""
+        if not self._pending:
+            return
+        start = thread_time()
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        self.frames += 1
+        for key, value in pending.items():
+            if self._shown.get(key, self) == value:
+                continue
+            self._shown[key] = value
+            self._setters[key](value)
+            self.repaints += 1
+        self.cpu_time += thread_time() - start
+
+    def report(self):
+        """One-line summary of the work done so far."""
+        return (
+            f"render: {self.posts} posts, {self.frames} frames, "
+            f"{self.repaints} widget updates, {self.cpu_time * 1000:.1f} ms CPU "
+            f"(cap {self.max_fps} fps)"
+        )
@@ -0,0 +1,220 @@
+"""
+Persistent game results in SQLite.
+
+Finished games are queued by the game threads and written by a single writer
+thread in batched transactions, so neither the game loop nor the GUI ever waits
+on the disk.  The database runs in WAL mode, which lets leaderboard queries
+read while the writer appends.
+
+A game an operator paused, retimed or skipped a phase of is stored with its
+count of interventions, and left off the leaderboard.
+
+Usage:
+    python -m bomb_core.results --db results.db fastest
+    python -m bomb_core.results --db results.db penalties --limit 20
+"""
+import argparse
+import os
+import queue
+import sqlite3
+from threading import Thread
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    player TEXT NOT NULL,
+    seed INTEGER,
+    outcome TEXT NOT NULL,
+    started REAL NOT NULL,
+    duration REAL NOT NULL,
+    time_left INTEGER NOT NULL,
+    penalties INTEGER NOT NULL,
+    interventions INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS phase_results (
+    session_id INTEGER NOT NULL REFERENCES sessions(id),
+    phase TEXT NOT NULL,
+    solve_time REAL,
+    penalties INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_penalties ON sessions(penalties);
+CREATE INDEX IF NOT EXISTS phase_results_session ON phase_results(session_id);
+"""
+
+
+def connect(path):
+    """Open the results database, creating the schema if needed."""
+    db = sqlite3.connect(path, timeout=10)
+    db.execute("PRAGMA journal_mode=WAL")
+    # WAL is crash-safe at NORMAL; FULL would fsync on every commit
+    db.execute("PRAGMA synchronous=NORMAL")
+    db.executescript(SCHEMA)
+    columns = {row[1] for row in db.execute("PRAGMA table_info(sessions)")}
+    if "interventions" not in columns:  # A database from before the column
+        db.execute(
+            "ALTER TABLE sessions ADD COLUMN interventions INTEGER NOT NULL DEFAULT 0"
+        )
+    # The leaderboard index needs the column, so it is made once that exists
+    db.execute("DROP INDEX IF EXISTS sessions_fastest")
+    db.execute(
+        "CREATE INDEX IF NOT EXISTS sessions_leaderboard"
+        " ON sessions(outcome, interventions, duration)"
+    )
+    return db
+
+
+def summarize(game):
+    """
+    Snapshot a finished game as a plain record for the writer.
+
+    Returns:
+        tuple: (session row, list of (phase, solve time, penalties)).
+    """
+    session = (
+        game.player,
+        game.seed,
+        game.state.status,
+        game.started_at,
+        game.ended_at - game.started_at,
+        game.timer._value,
+        sum(game.penalties.values()),
+        game.interventions,
+    )
+    phases = [
+        (phase.name, game.solve_times.get(phase.name), game.penalties.get(phase.name, 0))
+        for phase in game.phases
+    ]
+    return session, phases
+
+
+class ResultsStore(Thread):
+    def __init__(self, path, batch_size=100, flush_interval=1.0, name="Results"):
+        """
+        Background writer for finished games.
+
+        Args:
+            path (str): SQLite database file.
+            batch_size (int): Most games written per transaction.
+            flush_interval (float): Seconds a queued game may wait for a batch.
+            name (str): Thread name.
+        """
+        super().__init__(name=name, daemon=True)
+        self.path = path
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._queue = queue.SimpleQueue()
+        self.written = 0
+        connect(path).close()  # Fail early on a bad path, not on the writer
+
+    def attach(self, game):
+        """Record `game` when it is defused or explodes."""
+
+        def on_game_event(event, **data):
+            if event in ("defused", "exploded"):
+                self.record(game)
+
+        game.subscribe(on_game_event)
+
+    def record(self, game):
+        """Queue a finished game; never blocks."""
+        self._queue.put(summarize(game))
+
+    def stop(self):
+        """Write whatever is queued, then end the writer."""
+        self._queue.put(None)
+
+    def run(self):
+        db = connect(self.path)
+        running = True
+        while running:
+            batch = [self._queue.get()]
+            try:
+                while len(batch) < self._batch_size:
+                    batch.append(self._queue.get(timeout=self._flush_interval))
+            except queue.Empty:
+                pass
+            if None in batch:
+                running = False
+                batch = [item for item in batch if item is not None]
+            if batch:
+                self._write(db, batch)
+        db.close()
+
+    def _write(self, db, batch):
+        with db:
+            for session, phases in batch:
+                cursor = db.execute(
+                    "INSERT INTO sessions (player, seed, outcome, started, duration,"
+                    " time_left, penalties, interventions) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    session,
+                )
+                db.executemany(
+                    "INSERT INTO phase_results (session_id, phase, solve_time, penalties)"
+                    " VALUES (?, ?, ?, ?)",
+                    [(cursor.lastrowid,) + phase for phase in phases],
+                )
+        self.written += len(batch)
+
+
+def fastest_defuses(db, limit=10):
+    """
+    Quickest defuses first: (player, seconds, penalties, started).
+
+    Games an operator intervened in are left out.
+    """
+    return db.execute(
+        "SELECT player, duration, penalties, started FROM sessions"
+        " WHERE outcome = 'defused' AND interventions = 0 ORDER BY duration LIMIT ?",
+        (limit,),
+    ).fetchall()
+
+
+def most_penalties(db, limit=10):
+    """Most wrong answers first: (player, penalties, outcome, started)."""
+    return db.execute(
+        "SELECT player, penalties, outcome, started FROM sessions"
+        " ORDER BY penalties DESC LIMIT ?",
+        (limit,),
+    ).fetchall()
+
+
+def store_from_environment(games):
+    """
+    Start a results store for `games` if BOMB_RESULTS_DB is set.
+
+    Returns:
+        ResultsStore: The running store, or None when results are off.
+    """
+    path = os.environ.get("BOMB_RESULTS_DB")
+    if not path:
+        return None
+    store = ResultsStore(path)
+    for game in games:
+        store.attach(game)
+    store.start()
+    return store
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bomb defusal leaderboards")
+    parser.add_argument("--db", default=os.environ.get("BOMB_RESULTS_DB", "results.db"))
+    parser.add_argument("board", choices=("fastest", "penalties"))
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    db = connect(args.db)
+    if args.board == "fastest":
+        for rank, (player, duration, penalties, _) in enumerate(
+            fastest_defuses(db, args.limit), 1
+        ):
+            print(f"{rank:>3}. {player:<20} {duration:7.1f}s  {penalties} penalties")
+    else:
+        for rank, (player, penalties, outcome, _) in enumerate(
+            most_penalties(db, args.limit), 1
+        ):
+            print(f"{rank:>3}. {player:<20} {penalties:>3} penalties  {outcome}")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+"""
+Monte Carlo difficulty simulator.
+
+Plays millions of games with statistical player models and reports how the
+defuse rate and the time left respond to the countdown and the penalty.
+Puzzles are drawn from the same generators and the same station config the
+game uses (--config, or BOMB_CONFIG), and penalties follow the same rules, so
+retuning the game retunes the simulation.
+
+Usage:
+    python -m bomb_core.simulator --games 2000000 --player average \\
+        --countdowns 240,300,360 --penalties 15,30,45
+    python -m bomb_core.simulator --config station.json
+"""
+import argparse
+import random
+
+import numpy as np
+
+from bomb_core.config import DEFAULT_CONFIG, config_from_environment, load_config
+from bomb_core.puzzles import (
+    PENALIZED_PHASES,
+    PHASE_ORDER,
+    choose_wires_question,
+    generate_keypad,
+    generate_toggles,
+)
+
+PHASES = PHASE_ORDER  # The phases the stations play, in their order
+PHASE_TRANSITION = 1.0  # The GUI waits a second before loading the next phase
+POOL_SIZE = 4096  # Puzzles drawn from each generator per simulation
+
+
+class PhaseModel:
+    def __init__(self, median, sigma, error_rate, retry):
+        """
+        How long one kind of player takes on a phase, and how often they slip.
+
+        Args:
+            median (float): Median seconds to solve a puzzle of average size.
+            sigma (float): Log-normal spread of the solve and retry times.
+            error_rate (float): Chance that any given attempt is wrong.
+            retry (float): Median seconds spent on each wrong attempt.
+        """
+        self.median = median
+        self.sigma = sigma
+        self.error_rate = error_rate
+        self.retry = retry
+
+
+PLAYER_PROFILES = {
+    "novice": {
+        "Toggles": PhaseModel(45, 0.6, 0.35, 12),
+        "Button": PhaseModel(5, 0.6, 0.0, 1),
+        "Keypad": PhaseModel(120, 0.6, 0.45, 30),
+        "Wires": PhaseModel(25, 0.7, 0.5, 6),
+    },
+    "average": {
+        "Toggles": PhaseModel(25, 0.5, 0.2, 8),
+        "Button": PhaseModel(3, 0.5, 0.0, 1),
+        "Keypad": PhaseModel(70, 0.5, 0.3, 20),
+        "Wires": PhaseModel(15, 0.6, 0.35, 4),
+    },
+    "expert": {
+        "Toggles": PhaseModel(10, 0.4, 0.05, 4),
+        "Button": PhaseModel(1.5, 0.4, 0.0, 1),
+        "Keypad": PhaseModel(35, 0.4, 0.1, 10),
+        "Wires": PhaseModel(8, 0.5, 0.15, 3),
+    },
+}
+
+
+def build_puzzle_pools(config=DEFAULT_CONFIG, seed=None, size=POOL_SIZE):
+    """
+    Draw puzzles from the game's generators and reduce them to difficulty arrays.
+
+    Each phase gets a relative work factor per puzzle (1.0 is an average
+    puzzle) and a cap on how many wrong attempts the puzzle allows.
+
+    Args:
+        config (Config): Station config with the toggle problems, keypad
+            table and wires questions to draw from.
+        seed (int): Seed for the puzzle draws.
+        size (int): Number of puzzles to draw per phase.
+
+    Returns:
+        dict: Phase name -> (factor array, max-errors array or None).
+    """
+    rng = random.Random(seed)
+
+    # Toggles: every bit that has to be switched on is a flip to make
+    flips = np.array(
+        [generate_toggles(rng, config.toggle_problems)[0].count("1") for _ in range(size)], dtype=np.float64
+    )
+
+    # Keypad: mental binary multiplication scales with the operand lengths
+    bits = np.empty(size, dtype=np.float64)
+    for i in range(size):
+        (num1, num2), _ = generate_keypad(rng, config.keypad_table)
+        bits[i] = len(num1) + len(num2)
+
+    # Wires: reading time scales with the choices, and each wrong wire stays cut
+    wires = [choose_wires_question(rng, config.wires_questions) for _ in range(size)]
+    choices = np.array([len(q["choices"]) for q in wires], dtype=np.float64)
+
+    return {
+        "Toggles": (flips / flips.mean(), None),
+        # Button: one press, the same for every game; it has no wrong answer
+        "Button": (np.ones(size), None),
+        "Keypad": (bits / bits.mean(), None),
+        "Wires": (choices / choices.mean(), (choices - 1).astype(np.int64)),
+    }
+
+
+def simulate_chunk(gen, pools, player, n):
+    """
+    Play n games through every phase.
+
+    Returns:
+        tuple: (seconds spent per game, penalised mistakes per game).
+    """
+    elapsed = np.full(n, PHASE_TRANSITION * (len(PHASES) - 1))
+    mistakes = np.zeros(n, dtype=np.int64)
+    for phase in PHASES:
+        model = player[phase]
+        factors, caps = pools[phase]
+        idx = gen.integers(len(factors), size=n)
+        elapsed += gen.lognormal(np.log(model.median * factors[idx]), model.sigma)
+
+        errors = gen.geometric(1.0 - model.error_rate, size=n) - 1
+        if caps is not None:
+            np.minimum(errors, caps[idx], out=errors)
+        elapsed += errors * gen.lognormal(np.log(model.retry), model.sigma, size=n)
+        if phase in PENALIZED_PHASES:
+            mistakes += errors
+    return elapsed, mistakes
+
+
+def simulate(
+    games=1_000_000,
+    countdowns=None,
+    penalties=None,
+    player="average",
+    seed=None,
+    chunk=250_000,
+    config=DEFAULT_CONFIG,
+):
+    """
+    Simulate games for every (countdown, penalty) pair.
+
+    The same simulated players are scored against every grid cell, so
+    differences between cells come from the parameters, not sampling noise.
+
+    Args:
+        games (int): Number of games to simulate.
+        countdowns (sequence): Countdowns to evaluate; the config's by default.
+        penalties (sequence): Penalties to evaluate; the config's by default.
+        player (str): Key of PLAYER_PROFILES.
+        seed (int): Seed for reproducible runs.
+        chunk (int): Games simulated per vectorised batch.
+        config (Config): Station config the puzzles are drawn from.
+
+    Returns:
+        list: One dict per grid cell with the defuse rate and time-left stats.
+    """
+    if countdowns is None:
+        countdowns = (config.countdown,)
+    if penalties is None:
+        penalties = (config.penalty,)
+    profile = PLAYER_PROFILES[player]
+    pools = build_puzzle_pools(config, seed)
+    gen = np.random.default_rng(seed)
+
+    cd = np.asarray(countdowns, dtype=np.float64)[:, None, None]
+    pen = np.asarray(penalties, dtype=np.float64)[None, :, None]
+    bins = int(cd.max()) + 1
+    # Time-left histograms in whole seconds, as the timer shows them
+    hist = np.zeros((cd.shape[0], pen.shape[1], bins), dtype=np.int64)
+    defused = np.zeros((cd.shape[0], pen.shape[1]), dtype=np.int64)
+    total_mistakes = 0
+
+    done = 0
+    while done < games:
+        n = min(chunk, games - done)
+        elapsed, mistakes = simulate_chunk(gen, pools, profile, n)
+        total_mistakes += int(mistakes.sum())
+        left = cd - elapsed[None, None, :] - pen * mistakes[None, None, :]
+        won = left > 0
+        defused += won.sum(axis=2)
+        seconds = np.clip(left, 0, bins - 1).astype(np.int64)
+        for i in range(cd.shape[0]):
+            for j in range(pen.shape[1]):
+                hist[i, j] += np.bincount(seconds[i, j][won[i, j]], minlength=bins)
+        done += n
+
+    results = []
+    for i, countdown in enumerate(countdowns):
+        for j, penalty in enumerate(penalties):
+            cdf = np.cumsum(hist[i, j])
+            wins = int(defused[i, j])
+            row = {
+                "countdown": countdown,
+                "penalty": penalty,
+                "defuse_rate": wins / games,
+                "mean_mistakes": total_mistakes / games,
+            }
+            for q in (10, 50, 90):
+                row[f"p{q}_left"] = (
+                    int(np.searchsorted(cdf, wins * q / 100)) if wins else 0
+                )
+            results.append(row)
+    return results
+
+
+def _int_list(text):
+    return [int(v) for v in text.split(",") if v]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bomb defusal difficulty simulator")
+    parser.add_argument("--games", type=int, default=1_000_000)
+    parser.add_argument("--countdowns", type=_int_list, help="default: config's -60,+0,+60")
+    parser.add_argument("--penalties", type=_int_list, help="default: config's x0.5,x1,x1.5")
+    parser.add_argument("--player", choices=sorted(PLAYER_PROFILES), default="average")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--chunk", type=int, default=250_000)
+    parser.add_argument("--config", help="station config file; BOMB_CONFIG by default")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.config:
+            config = load_config(args.config)
+        else:
+            config_file = config_from_environment()
+            config = config_file.current() if config_file else DEFAULT_CONFIG
+    except (OSError, ValueError) as e:
+        parser.exit(1, f"{e}\n")
+    countdowns = args.countdowns or [
+        max(1, config.countdown - 60), config.countdown, config.countdown + 60
+    ]
+    penalties = args.penalties or [
+        config.penalty // 2, config.penalty, config.penalty + config.penalty // 2
+    ]
+
+    results = simulate(
+        args.games, countdowns, penalties, args.player, args.seed, args.chunk, config
+    )
+    print(f"{args.games} games, {args.player} player, {config.source or 'default config'}")
+    print("countdown  penalty  defused   p10   p50   p90  (seconds left when defused)")
+    for row in results:
+        print(
+            f"{row['countdown']:>9}  {row['penalty']:>7}  {row['defuse_rate']:>7.1%}"
+            f"  {row['p10_left']:>4}  {row['p50_left']:>4}  {row['p90_left']:>4}"
+        )
+    print(f"Penalised mistakes per game: {results[0]['mean_mistakes']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+Automated solver bot and soak-test monitor.
+
+The bot reads the active puzzle straight from the phase threads and drives the
+same mock or loop-back inputs a player would, with a configurable reaction time
+and error injection.  SoakMonitor samples memory, thread count and loop jitter
+so long unattended runs show leaks and slowdowns.
+"""
+import os
+import random
+import threading
+from threading import Thread
+from time import monotonic, sleep
+
+
+class SolverBot(Thread):
+    def __init__(
+        self,
+        game_state,
+        phases,
+        inputs,
+        reaction_time=0.2,
+        hold_time=0.25,
+        error_rate=0.0,
+        retry_after=3.0,
+        seed=None,
+        name="Solver",
+    ):
+        """
+        A bot that plays whichever phase the game is currently on.
+
+        Args:
+            game_state (GameState): The game's phase tracker.
+            phases (list): Phase threads in game order (phase 1 first).
+            inputs (dict): Inputs to drive, keyed by phase name: a list of pins
+                for "Toggles" and "Wires", a pin for "Button" and a keypad with
+                simulate_key_press/clear_keys for "Keypad".
+            reaction_time (float): Seconds between consecutive player actions.
+            hold_time (float): Seconds keys and the button are held down; must
+                exceed the phase poll interval or presses are missed.
+            error_rate (float): Chance of a wrong attempt before each right one.
+            retry_after (float): Seconds to wait for a solve before trying again.
+            seed (int): Seed for the error injection.
+            name (str): Thread name.
+        """
+        super().__init__(name=name, daemon=True)
+        self._game_state = game_state
+        self._phases = phases
+        self._inputs = inputs
+        self._reaction_time = reaction_time
+        self._hold_time = hold_time
+        self._error_rate = error_rate
+        self._retry_after = retry_after
+        self._rng = random.Random(seed)
+        self._running = True
+        self.mistakes = 0
+
+    def stop(self):
+        self._running = False
+
+    def run(self):
+        attempted, attempted_at = None, 0.0
+        while self._running:
+            # The first unsolved phase: the current one, or in parallel mode
+            # the next module along
+            phase = next((phase for phase in self._phases if not phase._solved), None)
+            if phase is None:
+                break
+            stale = monotonic() - attempted_at > self._retry_after
+            if phase is not attempted or stale:
+                attempted = phase
+                getattr(self, f"_solve_{phase.name.lower()}")(phase)
+                attempted_at = monotonic()
+            sleep(self._reaction_time)
+
+    def _wait(self):
+        sleep(self._reaction_time)
+
+    def _make_mistake(self):
+        if self._rng.random() < self._error_rate:
+            self.mistakes += 1
+            return True
+        return False
+
+    def _solve_toggles(self, phase):
+        pins = self._inputs["Toggles"]
+        if self._make_mistake():
+            for pin in pins:
+                pin.value = self._rng.random() < 0.5
+                self._wait()
+        for pin, bit in zip(pins, phase._solution):
+            pin.value = bit == "1"
+            self._wait()
+
+    def _solve_button(self, phase):
+        pin = self._inputs["Button"]
+        pin.value = True
+        sleep(self._hold_time)
+        pin.value = False
+
+    def _press(self, key):
+        keypad = self._inputs["Keypad"]
+        keypad.simulate_key_press(key)
+        sleep(self._hold_time)
+        keypad.clear_keys()
+        self._wait()
+
+    def _solve_keypad(self, phase):
+        if self._make_mistake():
+            for digit in str(phase._solution + 1):
+                self._press(int(digit))
+            self._press("*")
+        for digit in str(phase._solution):
+            self._press(int(digit))
+        self._press("*")
+
+    def _solve_wires(self, phase):
+        pins = self._inputs["Wires"]
+        correct = ord(phase._current_question["correct"]) - 65
+        if self._make_mistake():
+            wrong = [i for i, pin in enumerate(pins) if pin.value and i != correct]
+            if wrong:
+                pins[self._rng.choice(wrong)].value = False
+                self._wait()
+        pins[correct].value = False
+
+
+def rss_bytes():
+    """Resident set size of this process, in bytes."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        import resource
+
+        # ru_maxrss is the peak rather than the current size, in KiB on Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class SoakMonitor(Thread):
+    def __init__(self, interval=0.1, name="SoakMonitor"):
+        """
+        Samples loop jitter continuously and resources at game boundaries.
+
+        Jitter is how late a fixed-interval sleep wakes up, which is what every
+        phase loop in the game experiences.
+
+        Args:
+            interval (float): Seconds between jitter samples.
+            name (str): Thread name.
+        """
+        super().__init__(name=name, daemon=True)
+        self._interval = interval
+        self._running = True
+        self._lock = threading.Lock()
+        self._jitter = []
+        self.games = 0
+        self.outcomes = {}
+        self.start_rss = rss_bytes()
+        self.start_threads = threading.active_count()
+
+    def stop(self):
+        self._running = False
+
+    def run(self):
+        deadline = monotonic() + self._interval
+        while self._running:
+            sleep(max(0.0, deadline - monotonic()))
+            late = monotonic() - deadline
+            with self._lock:
+                self._jitter.append(late)
+            deadline += self._interval
+            if late > self._interval:
+                # Resynchronise rather than firing a burst of catch-up samples
+                deadline = monotonic() + self._interval
+
+    def game_finished(self, outcome):
+        """Record a finished game and return a one-line report."""
+        self.games += 1
+        self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+        with self._lock:
+            jitter, self._jitter = sorted(self._jitter), []
+        rss = rss_bytes()
+        report = (
+            f"game {self.games}: {outcome} | "
+            f"rss {rss / 2**20:.1f} MiB ({(rss - self.start_rss) / 2**10:+.0f} KiB) | "
+            f"threads {threading.active_count()} "
+            f"({threading.active_count() - self.start_threads:+d})"
+        )
+        if jitter:
+            p50 = jitter[len(jitter) // 2]
+            p99 = jitter[min(len(jitter) - 1, int(len(jitter) * 0.99))]
+            report += (
+                f" | jitter p50 {p50 * 1000:.2f} ms p99 {p99 * 1000:.2f} ms"
+                f" max {jitter[-1] * 1000:.2f} ms"
+            )
+        return report
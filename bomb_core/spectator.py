@@ -0,0 +1,326 @@
+"""
+Spectator feed: compact, delta-encoded game state over local UDP.
+
+Viewers send a HELLO datagram to the feed's port and keep repeating it to stay
+subscribed.  The feed answers with a full keyframe, then sends only the fields
+that changed, with a fresh keyframe every couple of seconds so a viewer that
+missed a datagram recovers.  Game threads only update a state record and set
+an event; all encoding and sending happens on the feed's own thread, so the
+game loop never waits on the network.
+
+Frame layout (network byte order):
+
+    header   "!2sBBHB"  magic b"BD", version, station, sequence, field mask
+    time     H          seconds left                    (mask & F_TIME)
+    phase    B          current phase number            (mask & F_PHASE)
+    status   B          0 armed, 1 defused, 2 exploded  (mask & F_STATUS)
+    toggles  B          toggle pin bitmask, pin 0 = bit 0 (mask & F_TOGGLES)
+    wires    BB         wire count, intact bitmask      (mask & F_WIRES)
+    keypad   BH         digit count, entered value      (mask & F_KEYPAD)
+
+Usage (viewer):
+    python -m bomb_core.spectator --port 47800
+"""
+import argparse
+import os
+import socket
+import struct
+import threading
+from threading import Thread
+from time import monotonic
+
+from bomb_core.clock import format_time
+
+DEFAULT_PORT = 47800
+MAGIC = b"BD"
+VERSION = 2
+HELLO = b"HELLO"
+HEADER = struct.Struct("!2sBBHB")
+
+F_TIME = 0x01
+F_PHASE = 0x02
+F_STATUS = 0x04
+F_TOGGLES = 0x08
+F_WIRES = 0x10
+F_KEYPAD = 0x20
+F_KEYFRAME = 0x80
+
+# (flag, state key, struct format) in frame order
+FIELDS = (
+    (F_TIME, "time", struct.Struct("!H")),
+    (F_PHASE, "phase", struct.Struct("!B")),
+    (F_STATUS, "status", struct.Struct("!B")),
+    (F_TOGGLES, "toggles", struct.Struct("!B")),
+    (F_WIRES, "wires", struct.Struct("!BB")),
+    (F_KEYPAD, "keypad", struct.Struct("!BH")),
+)
+STATUSES = ("armed", "defused", "exploded")
+
+
+def bitmask(values):
+    """Pack a sequence of truthy pin values into an int, first pin in bit 0."""
+    mask = 0
+    for i, value in enumerate(values):
+        if value:
+            mask |= 1 << i
+    return mask
+
+
+def encode(station, seq, state, previous=None):
+    """
+    Encode the fields of `state` that differ from `previous`.
+
+    Returns:
+        bytes: The frame, or None if nothing changed.
+    """
+    mask = 0 if previous else F_KEYFRAME
+    body = []
+    for flag, key, fmt in FIELDS:
+        value = state[key]
+        if previous and previous[key] == value:
+            continue
+        mask |= flag
+        body.append(fmt.pack(*value) if isinstance(value, tuple) else fmt.pack(value))
+    if mask == 0:
+        return None
+    return HEADER.pack(MAGIC, VERSION, station, seq & 0xFFFF, mask) + b"".join(body)
+
+
+def decode(frame):
+    """
+    Decode a frame.
+
+    Returns:
+        tuple: (station, sequence, is_keyframe, dict of the fields present).
+    """
+    magic, version, station, seq, mask = HEADER.unpack_from(frame)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("not a spectator frame")
+    offset = HEADER.size
+    fields = {}
+    for flag, key, fmt in FIELDS:
+        if mask & flag:
+            value = fmt.unpack_from(frame, offset)
+            fields[key] = value if len(value) > 1 else value[0]
+            offset += fmt.size
+    return station, seq, bool(mask & F_KEYFRAME), fields
+
+
+class SpectatorFeed(Thread):
+    def __init__(
+        self,
+        port=DEFAULT_PORT,
+        host="127.0.0.1",
+        expiry=5.0,
+        keyframe_interval=2.0,
+        name="Spectator",
+    ):
+        """
+        Publishes the state of one or more games to UDP subscribers.
+
+        Args:
+            port (int): UDP port viewers send HELLO to.
+            host (str): Address to bind; loopback keeps the feed local.
+            expiry (float): Seconds a viewer stays subscribed without a HELLO.
+            keyframe_interval (float): Seconds between full keyframes.
+            name (str): Thread name.
+        """
+        super().__init__(name=name, daemon=True)
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.bind((host, port))
+        self._sock.settimeout(0.5)
+        self._expiry = expiry
+        self._keyframe_interval = keyframe_interval
+        self._keyframe_due = True
+        self._last_keyframe = 0.0
+        self._lock = threading.Lock()
+        self._changed = threading.Event()
+        self._states = {}
+        self._sent = {}
+        self._subscribers = {}  # address -> last HELLO time
+        self._seq = 0
+        self._running = True
+        self.frames_sent = 0
+
+    def attach(self, game, station=0):
+        """Mirror `game` on the feed as `station`."""
+        wires = game.wires._pins if hasattr(game, "wires") else game.config.pins["wires"]
+        self._states[station] = {
+            "time": game.timer._value,
+            "phase": game.state.current_phase,
+            "status": 0,
+            "toggles": 0,
+            "wires": (len(wires), bitmask([True] * len(wires))),
+            "keypad": (0, 0),
+        }
+        game.subscribe(lambda event, **data: self.on_game_event(station, event, data))
+        self._changed.set()
+
+    def on_game_event(self, station, event, data):
+        """Game subscriber: record the change and wake the sender."""
+        state = self._states[station]
+        with self._lock:
+            if event in ("tick", "penalty"):
+                state["time"] = data["value"]
+            elif event == "solved":
+                state["phase"] = data["next"]
+            elif event in ("defused", "exploded"):
+                state["status"] = STATUSES.index(event)
+            elif event == "inputs":
+                values = data["values"]
+                if data["phase"] == "Toggles":
+                    state["toggles"] = bitmask(values)
+                elif data["phase"] == "Wires":
+                    state["wires"] = (len(values), bitmask(values))
+                elif data["phase"] == "Keypad":
+                    state["keypad"] = (len(values), int(values or 0))
+        self._changed.set()
+
+    def stop(self):
+        self._running = False
+        self._changed.set()
+
+    def run(self):
+        receiver = Thread(target=self._receive, name=f"{self.name}-hello", daemon=True)
+        receiver.start()
+        while self._running:
+            self._changed.wait()
+            self._changed.clear()
+            self._publish()
+        self._sock.close()
+
+    def _receive(self):
+        while self._running:
+            try:
+                data, address = self._sock.recvfrom(64)
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            if data == HELLO:
+                with self._lock:
+                    new = address not in self._subscribers
+                    self._subscribers[address] = monotonic()
+                if new:
+                    # Newcomers need a keyframe before deltas mean anything
+                    self._keyframe_due = True
+                    self._changed.set()
+
+    def _publish(self):
+        now = monotonic()
+        with self._lock:
+            for address, seen in list(self._subscribers.items()):
+                if now - seen > self._expiry:
+                    del self._subscribers[address]
+            subscribers = tuple(self._subscribers)
+            states = {station: dict(state) for station, state in self._states.items()}
+        if not subscribers:
+            return
+        if self._keyframe_due or now - self._last_keyframe > self._keyframe_interval:
+            self._keyframe_due = False
+            self._last_keyframe = now
+            self._sent.clear()
+        for station, state in states.items():
+            frame = encode(station, self._seq, state, self._sent.get(station))
+            if frame is None:
+                continue
+            self._seq += 1
+            self._sent[station] = state
+            for address in subscribers:
+                try:
+                    self._sock.sendto(frame, address)
+                    self.frames_sent += 1
+                except OSError:
+                    pass
+
+
+def feed_from_environment(games):
+    """
+    Start a feed for `games` if BOMB_SPECTATOR_PORT is set.
+
+    Games are numbered as stations in the order given.
+
+    Returns:
+        SpectatorFeed: The running feed, or None when spectating is off.
+    """
+    port = os.environ.get("BOMB_SPECTATOR_PORT")
+    if not port:
+        return None
+    feed = SpectatorFeed(int(port))
+    for station, game in enumerate(games):
+        feed.attach(game, station)
+    feed.start()
+    return feed
+
+
+class Viewer:
+    def __init__(self, port=DEFAULT_PORT, host="127.0.0.1"):
+        """
+        Subscribes to a feed and keeps the decoded state of every station.
+
+        Args:
+            port (int): The feed's UDP port.
+            host (str): The feed's address.
+        """
+        self._feed = (host, port)
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.settimeout(1.0)
+        self.stations = {}
+        self._last_hello = 0.0
+
+    def hello(self):
+        self._sock.sendto(HELLO, self._feed)
+        self._last_hello = monotonic()
+
+    def receive(self):
+        """
+        Wait for one frame and apply it.
+
+        Returns:
+            int: The station that changed, or None on timeout.
+        """
+        if monotonic() - self._last_hello > 1.0:
+            self.hello()
+        try:
+            frame = self._sock.recv(64)
+        except socket.timeout:
+            return None
+        station, seq, keyframe, fields = decode(frame)
+        if keyframe:
+            self.stations[station] = fields
+        elif station in self.stations:
+            self.stations[station].update(fields)
+        else:
+            return None  # Deltas before our keyframe
+        return station
+
+
+def describe(state):
+    """One-line text rendering of a station's state."""
+    time = state["time"]
+    digits, value = state["keypad"]
+    keypad = str(value).zfill(digits) if digits else ""
+    count, intact = state["wires"]
+    return (
+        f"{format_time(time)}  phase {state['phase']}  "
+        f"{STATUSES[state['status']]:<8}  toggles {state['toggles']:04b}  "
+        f"wires {intact:0{count}b}  keypad {keypad:<4}"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bomb defusal spectator viewer")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--host", default="127.0.0.1")
+    args = parser.parse_args(argv)
+
+    viewer = Viewer(args.port, args.host)
+    viewer.hello()
+    while True:
+        station = viewer.receive()
+        if station is not None:
+            print(f"station {station}: {describe(viewer.stations[station])}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
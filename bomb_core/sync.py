@@ -0,0 +1,296 @@
+"""
+Synchronized start for tournament stations over local UDP.
+
+One coordinator (`python -m bomb_core.sync serve`) keeps the reference clock.
+Every station runs a SyncFollower that pings it a few times a second and
+estimates its own offset from the coordinator NTP-style, keeping the sample
+with the shortest round trip.  Once every station has checked in, the
+coordinator announces a start instant on its clock a few seconds ahead; each
+station starts its game then and anchors its Timer to the shared clock, so the
+countdowns tick together and keep agreeing on the time left even if a
+station's clock runs a little fast or slow: the offset keeps being measured,
+and every tick is scheduled from it rather than from the previous tick.
+
+Packet layout (network byte order), after the header "!2sBB" (magic b"BS",
+version, kind):
+
+    PING   "!BId"    station, sequence, t0 (station clock, sent)
+    PONG   "!BIddd"  station, sequence, t0, t1 (received), t2 (sent back)
+    START  "!Hd"     game number, start instant on the coordinator's clock
+
+The coordinator repeats START in answer to every PING, so a station that
+missed one datagram picks it up on the next.
+
+Usage:
+    python -m bomb_core.sync serve --stations 3
+    BOMB_SYNC=10.0.0.1:47810 python modified_gui3.py
+"""
+import argparse
+import os
+import socket
+import struct
+import sys
+import threading
+from collections import deque
+from threading import Thread
+from time import monotonic
+
+DEFAULT_PORT = 47810
+MAGIC = b"BS"
+VERSION = 1
+HEADER = struct.Struct("!2sBB")
+PING, PONG, START = 1, 2, 3
+BODIES = {
+    PING: struct.Struct("!BId"),
+    PONG: struct.Struct("!BIddd"),
+    START: struct.Struct("!Hd"),
+}
+
+
+def encode(kind, *fields):
+    return HEADER.pack(MAGIC, VERSION, kind) + BODIES[kind].pack(*fields)
+
+
+def decode(packet):
+    """
+    Split a packet into its kind and fields.
+
+    Returns:
+        tuple: (kind, fields), or None for anything that is not a sync packet.
+    """
+    try:
+        magic, version, kind = HEADER.unpack_from(packet)
+        if magic != MAGIC or version != VERSION:
+            return None
+        return kind, BODIES[kind].unpack_from(packet, HEADER.size)
+    except (struct.error, KeyError):
+        return None
+
+
+class SyncCoordinator(Thread):
+    def __init__(self, port=DEFAULT_PORT, host="0.0.0.0", name="SyncCoordinator"):
+        """
+        The reference clock and the start announcements.
+
+        Args:
+            port (int): UDP port the stations ping.
+            host (str): Interface to listen on.
+            name (str): Thread name.
+        """
+        super().__init__(name=name, daemon=True)
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind((host, port))
+        self._sock.settimeout(0.5)
+        self._running = False
+        self.followers = {}  # Station address -> pings answered
+        self.game = 0
+        self.start_at = None
+
+    def schedule_start(self, lead=3.0):
+        """
+        Announce a new game starting `lead` seconds from now.
+
+        Returns:
+            float: The start instant, on the coordinator's clock.
+        """
+        self.start_at = monotonic() + lead
+        self.game = (self.game + 1) & 0xFFFF
+        return self.start_at
+
+    def stop(self):
+        self._running = False
+
+    def run(self):
+        self._running = True
+        while self._running:
+            try:
+                packet, address = self._sock.recvfrom(64)
+            except socket.timeout:
+                continue
+            received = monotonic()
+            message = decode(packet)
+            if message is None or message[0] != PING:
+                continue
+            station, seq, t0 = message[1]
+            self._sock.sendto(encode(PONG, station, seq, t0, received, monotonic()), address)
+            self.followers[address] = self.followers.get(address, 0) + 1
+            if self.start_at is not None:
+                self._sock.sendto(encode(START, self.game, self.start_at), address)
+        self._sock.close()
+
+
+class SyncFollower(Thread):
+    def __init__(
+        self, address, station=0, clock=monotonic, interval=0.25, samples=8,
+        name="SyncFollower",
+    ):
+        """
+        A station's view of the coordinator's clock.
+
+        Args:
+            address (tuple): The coordinator's (host, port).
+            station (int): Station number, echoed back in the replies.
+            clock (callable): This station's clock, in seconds.
+            interval (float): Seconds between pings.
+            samples (int): Recent pings the offset is estimated from.  The
+                window is kept short because a station clock that runs fast
+                or slow makes old samples wrong by that rate times their age.
+            name (str): Thread name.
+        """
+        super().__init__(name=name, daemon=True)
+        self._address = address
+        self._station = station
+        self._clock = clock
+        self._interval = interval
+        self._samples = deque(maxlen=samples)  # (delay, offset)
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._running = False
+        self._seq = 0
+        self._pending = None  # Game waiting for its start
+        self._started_game = None  # Number of the START already acted on
+        self.offset = None  # Coordinator clock minus ours
+        self.delay = None  # Round trip of the sample the offset came from
+
+    def now(self):
+        """The coordinator's clock, as estimated from ours."""
+        return self._clock() + self.offset
+
+    def start_game(self, game):
+        """
+        Start `game` at the next start the coordinator announces.
+
+        Its Timer is anchored to the coordinator's clock, so it ticks on the
+        same instants as every other station's.  Returns at once.
+        """
+        self._pending = game
+
+    def stop(self):
+        self._running = False
+
+    def run(self):
+        self._running = True
+        self._sock.settimeout(self._interval)
+        while self._running:
+            self._seq = (self._seq + 1) & 0xFFFFFFFF
+            self._sock.sendto(encode(PING, self._station, self._seq, self._clock()), self._address)
+            deadline = self._clock() + self._interval
+            while self._running:
+                left = deadline - self._clock()
+                if left <= 0:
+                    break
+                self._sock.settimeout(left)
+                try:
+                    packet = self._sock.recv(64)
+                except socket.timeout:
+                    break
+                except OSError:
+                    continue  # ICMP unreachable while the coordinator restarts
+                self._receive(packet, self._clock())
+        self._sock.close()
+
+    def _receive(self, packet, t3):
+        message = decode(packet)
+        if message is None:
+            return
+        kind, fields = message
+        if kind == PONG:
+            station, seq, t0, t1, t2 = fields
+            if station != self._station or seq != self._seq:
+                return  # A late reply; its round trip would be overstated
+            self._samples.append(((t3 - t0) - (t2 - t1), ((t1 - t0) + (t2 - t3)) / 2))
+            self.delay, self.offset = min(self._samples)
+        elif kind == START and self.offset is not None:
+            number, start = fields
+            game = self._pending
+            if game is None or number == self._started_game:
+                return
+            self._pending = None
+            self._started_game = number
+            game.timer.anchor(self.now, start)
+            threading.Timer(max(0.0, start - self.now()), game.start).start()
+
+
+def sync_from_environment():
+    """
+    Follow a sync coordinator if BOMB_SYNC is set to its host:port.
+
+    Returns:
+        SyncFollower: The running follower, or None when stations are not
+        synchronized.  Pass it each game with start_game() instead of
+        calling game.start().
+    """
+    address = os.environ.get("BOMB_SYNC")
+    if not address:
+        return None
+    host, _, port = address.rpartition(":")
+    follower = SyncFollower((host or "127.0.0.1", int(port or DEFAULT_PORT)))
+    follower.start()
+    return follower
+
+
+def serve(args):
+    coordinator = SyncCoordinator(args.port, args.host)
+    coordinator.start()
+    print(f"waiting for {args.stations} station(s) on port {args.port}", flush=True)
+    # A station needs a few pings for a good offset before it is counted
+    while sum(pings >= 8 for pings in coordinator.followers.values()) < args.stations:
+        threading.Event().wait(0.25)
+    coordinator.schedule_start(args.lead)
+    print(f"game {coordinator.game} starts in {args.lead:.1f}s", flush=True)
+    coordinator.join()
+
+
+def follow(args):
+    """A headless station that logs when each of its ticks really happened."""
+    from bomb_core.game import Game
+    from bomb_core.mock_io import MockSeg7x4
+
+    # A station clock that is off by `skew` seconds and gains `drift` per second
+    def clock():
+        return monotonic() * (1 + args.drift) + args.skew
+
+    follower = SyncFollower((args.host, args.port), args.station, clock)
+    game = Game(MockSeg7x4(False), {}, (), countdown=args.countdown)
+    out = open(args.log, "w") if args.log else sys.stdout
+    done = threading.Event()
+
+    def on_game_event(event, **data):
+        if event == "tick":
+            print(f"{data['value']} {monotonic():.6f}", file=out, flush=True)
+        elif event in ("defused", "exploded"):
+            done.set()
+
+    game.subscribe(on_game_event)
+    follower.start()
+    follower.start_game(game)
+    done.wait()
+    print(
+        f"# offset error {(follower.offset - (monotonic() - clock())) * 1000:+.3f} ms, "
+        f"delay {follower.delay * 1000:.3f} ms",
+        file=out, flush=True,
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Synchronized station start")
+    commands = parser.add_subparsers(dest="command", required=True)
+    server = commands.add_parser("serve", help="run the coordinator")
+    server.add_argument("--port", type=int, default=DEFAULT_PORT)
+    server.add_argument("--host", default="0.0.0.0")
+    server.add_argument("--stations", type=int, default=1, help="stations to wait for")
+    server.add_argument("--lead", type=float, default=3.0, help="seconds until the start")
+    station = commands.add_parser("follow", help="run a headless test station")
+    station.add_argument("--port", type=int, default=DEFAULT_PORT)
+    station.add_argument("--host", default="127.0.0.1")
+    station.add_argument("--station", type=int, default=0)
+    station.add_argument("--skew", type=float, default=0.0, help="clock offset, seconds")
+    station.add_argument("--drift", type=float, default=0.0, help="clock rate error, e.g. 1e-4")
+    station.add_argument("--countdown", type=int, default=300)
+    station.add_argument("--log", help="file for the tick times; stdout by default")
+    args = parser.parse_args(argv)
+    serve(args) if args.command == "serve" else follow(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Colours and fonts for the Qt frontend, built once.
+
+Every text colour the GUI uses is a state, and every text size a role:
+
+    states  normal, solved, wrong, unsolved, exploded, defused
+    roles   phase, timer, question, status, strong_status, penalty,
+            game_status, headline, tile_title
+
+Theme builds one QPalette per state and one QFont per role when the first
+window opens.  Restyling a widget for a new state is then a palette and font
+swap -- no stylesheet is parsed or matched, and the widget is not re-polished,
+so a status change costs about as much as setting its text.
+
+Widgets take their colour from the WindowText role, so a container's palette
+carries down to every label in it unless a label is given its own.
+"""
+from PyQt6.QtGui import QColor, QFont, QPalette
+
+FAMILIES = ["Verdana", "monospace"]
+BACKGROUND = "#1E1E1E"
+SURFACE = "#2D2D2D"  # Boxes and lit pins, a shade above the background
+
+STATE_COLOURS = {
+    "normal": "#00FF00",
+    "solved": "#008000",
+    "wrong": "#FF0000",
+    "unsolved": "#FF0000",
+    "exploded": "#FF0000",
+    "defused": "#008000",
+}
+
+# Role -> (pixel size, bold, underline)
+ROLE_FONTS = {
+    "phase": (18, False, False),
+    "timer": (32, False, False),
+    "question": (24, True, False),
+    "status": (28, False, False),
+    "strong_status": (28, True, False),
+    "penalty": (20, False, False),
+    "game_status": (32, False, True),
+    "headline": (60, True, True),
+    "tile_title": (14, True, False),
+}
+
+
+def make_font(pixel_size, bold=False, underline=False):
+    font = QFont()
+    font.setFamilies(FAMILIES)
+    font.setPixelSize(pixel_size)
+    font.setBold(bold)
+    font.setUnderline(underline)
+    return font
+
+
+class Theme:
+    def __init__(self, states=STATE_COLOURS, roles=ROLE_FONTS, background=BACKGROUND):
+        """
+        Palettes and fonts for every state and role; needs a QApplication.
+
+        Args:
+            states (dict): Text colour of each state.
+            roles (dict): (pixel size, bold, underline) of each role's font.
+            background (str): Window background, the same in every state.
+        """
+        self.colours = {state: QColor(colour) for state, colour in states.items()}
+        self.background = QColor(background)
+        self.surface = QColor(SURFACE)
+        self.palettes = {state: self._palette(colour) for state, colour in self.colours.items()}
+        self.fonts = {role: make_font(*spec) for role, spec in roles.items()}
+
+    def _palette(self, colour):
+        palette = QPalette()
+        for role in (QPalette.ColorRole.Window, QPalette.ColorRole.Base):
+            palette.setColor(role, self.background)
+        for role in (
+            QPalette.ColorRole.WindowText,
+            QPalette.ColorRole.Text,
+            QPalette.ColorRole.Highlight,
+        ):
+            palette.setColor(role, colour)
+        palette.setColor(QPalette.ColorRole.HighlightedText, self.background)
+        return palette
+
+    def window(self, widget):
+        """Paint a top-level widget's background and default its text."""
+        widget.setAutoFillBackground(True)
+        widget.setPalette(self.palettes["normal"])
+        font = widget.font()
+        font.setFamilies(FAMILIES)
+        widget.setFont(font)
+
+    def style(self, widget, role, state="normal"):
+        """Give `widget` the font of `role` and the colour of `state`."""
+        widget.setFont(self.fonts[role])
+        widget.setPalette(self.palettes[state])
+
+    def colour(self, widget, state):
+        """Switch `widget` to the colour of `state`, keeping its font."""
+        widget.setPalette(self.palettes[state])
+
+
+_theme = None
+
+
+def current_theme():
+    """The shared Theme, built on first use; call from the GUI thread."""
+    global _theme
+    if _theme is None:
+        _theme = Theme()
+    return _theme
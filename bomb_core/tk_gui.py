@@ -0,0 +1,93 @@
+"""
+Tkinter frontend for the game core, sized for the kiosk LCD.
+
+Lcd subscribes to a Game and mirrors its events onto labels; it owns no game
+logic, timers or input polling of its own.  Tk is not thread-safe, so label
+updates from game threads are queued and applied in batches by after().
+"""
+from tkinter import *
+
+from bomb_core.render import RenderScheduler
+
+
+# LCD Display GUI
+class Lcd(Frame):
+    def __init__(self, window, max_fps=10):
+        super().__init__(window, bg="black")
+        window.after(500, window.attributes, '-fullscreen', 'True')
+        self.render = RenderScheduler(max_fps)
+        self.setup()
+        self.after(self.render.interval_ms, self.flush)
+
+    def setup(self):
+        self.columnconfigure(0, weight=1)
+        self.columnconfigure(1, weight=2)
+        self.pack(fill=BOTH, expand=True)
+
+        # General labels for modules
+        labels = [
+            ("Time left: ", "_ltimer"),
+            ("Combination: ", "_lkeypad"),
+            ("Wires: ", "_lwires"),
+            ("Button: ", "_lbutton"),
+            ("Toggles: ", "_ltoggles"),
+            ("Status Normal", "_lstatus", "green"),
+        ]
+
+        self.elements = {}
+        for i, (text, var_name, *color) in enumerate(labels):
+            fg = color[0] if color else "white"
+            lbl = Label(self, bg="black", fg=fg, font=("Courier New", 24), text=text)
+            lbl.grid(row=i, column=0, columnspan=2, sticky=W)
+            self.elements[var_name] = lbl
+            self.render.register(var_name, lambda value, lbl=lbl: lbl.config(text=value[0], fg=value[1]))
+
+        # Additional labels
+        self._equation_label = Label(self, bg="black", fg="white", font=("Courier New", 24), text="")
+        self._equation_label.grid(row=5, column=0, columnspan=2, sticky=W)
+        
+        self._lquestion = Label(self, bg="black", fg="white", font=("Courier New", 12), text="")
+        self._lquestion.grid(row=7, column=0, columnspan=2, sticky=W)
+
+        self._lwires_choices = Label(self, bg="black", fg="white", font=("Courier New", 18), text="")
+        self._lwires_choices.grid(row=8, column=0, columnspan=2, sticky=W)
+
+    def update_label(self, var_name, text, fg="white"):
+        """
+        Update a specific label's text and color.
+
+        Safe to call from any thread; the change is applied by the next flush
+        and skipped if the label already shows it.
+        """
+        if var_name in self.elements:
+            self.render.post(var_name, (text, fg))
+
+    def flush(self):
+        """Apply queued label updates in one batch, then reschedule."""
+        self.render.flush()
+        self.after(self.render.interval_ms, self.flush)
+
+    def attach(self, game):
+        """Show `game` on the labels and follow its events."""
+        self.game = game
+        if getattr(game, "toggles", None):
+            self.update_label(
+                "_ltoggles", f"Toggles: Solve the equation: {game.toggles._math_problem}"
+            )
+        game.subscribe(self.on_game_event)
+
+    def on_game_event(self, event, **data):
+        if event == "tick":
+            value = data["value"]
+            self.update_label("_ltimer", f"Time left: {self.game.timer.face.text(value)}")
+        elif event == "inputs" and data["phase"] == "Toggles":
+            value = "".join(map(str, data["values"]))
+            self.update_label(
+                "_ltoggles", f"Toggles: {value} | Solve: {self.game.toggles._math_problem}"
+            )
+        elif event == "solved" and data["phase"] == "Toggles":
+            self.update_label("_ltoggles", "Toggles: SOLVED!", "green")
+        elif event == "defused":
+            self.update_label("_lstatus", "BOMB DEFUSED!", "green")
+        elif event == "exploded":
+            self.update_label("_lstatus", "BOMB EXPLODED!", "red")
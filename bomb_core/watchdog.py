@@ -0,0 +1,161 @@
+"""
+Watchdog for the timer and phase threads.
+
+Every watched loop writes a deadline into one shared array each time it goes
+to sleep or wakes: the time it should next be back.  The watchdog scans that
+array a couple of times a second, which costs a few microseconds, and reports
+any loop that is well past its deadline -- blocked on I2C, spinning in a poll,
+or dead from an exception -- with its stack and loop statistics.  A stalled
+phase can optionally have its I/O reopened, and a thread that died is started
+again on the same phase object.
+"""
+import os
+import sys
+import threading
+import traceback
+from array import array
+from math import inf
+from threading import Thread
+from time import monotonic, thread_time
+
+
+class Watchdog(Thread):
+    def __init__(self, grace=2.0, check_interval=0.5, restart_io=None, name="Watchdog"):
+        """
+        Watches the loops of one or more games.
+
+        Args:
+            grace (float): Seconds past its deadline before a loop counts as
+                stalled.
+            check_interval (float): Seconds between scans of the deadlines.
+            restart_io (dict): Optional callables keyed by thread name
+                ("Timer", "Keypad", ...), each given the stalled thread and
+                expected to reopen its inputs or display.
+            name (str): Thread name.
+        """
+        super().__init__(name=name, daemon=True)
+        self._grace = grace
+        self._check_interval = check_interval
+        self._restart_io = restart_io or {}
+        self._deadlines = array("d")
+        self._threads = []  # Slot -> (phase, thread running its loop)
+        self._stalled = set()  # Slots already reported for the current stall
+        self._stopped = threading.Event()
+        self.stalls = 0
+        self.restarts = 0
+        self.checks = 0
+        self.cpu_time = 0.0
+
+    def watch(self, game):
+        """
+        Give the timer and every phase of `game` a heartbeat slot.
+
+        Slots of loops that have stopped for good, such as those of a game
+        that was reset, are handed out again, so watching each new game does
+        not grow the arrays.
+        """
+        free = [
+            slot
+            for slot, (phase, thread) in enumerate(self._threads)
+            if not phase._running and not thread.is_alive()
+        ]
+        for phase in (game.timer, *game.phases):
+            if free:
+                slot = free.pop(0)
+                self._threads[slot][0]._heartbeat = None
+                # The deadline first, so a concurrent check() never holds the
+                # new loop to the old one's deadline
+                self._deadlines[slot] = inf
+                self._threads[slot] = (phase, phase)
+                self._stalled.discard(slot)
+            else:
+                # _threads first, so every slot check() sees has its thread
+                slot = len(self._threads)
+                self._threads.append((phase, phase))
+                self._deadlines.append(inf)
+            phase._heartbeat = (self._deadlines, slot)
+
+    def stop(self):
+        self._stopped.set()
+
+    def run(self):
+        while not self._stopped.wait(self._check_interval):
+            start = thread_time()
+            self.check()
+            self.cpu_time += thread_time() - start
+
+    def check(self):
+        """Scan every heartbeat once and deal with the stalled loops."""
+        self.checks += 1
+        now = monotonic()
+        for slot, deadline in enumerate(self._deadlines):
+            phase, thread = self._threads[slot]
+            dead = thread.ident is not None and not thread.is_alive()
+            if not phase._running or (now - deadline <= self._grace and not dead):
+                self._stalled.discard(slot)
+                continue
+            if slot in self._stalled:
+                continue
+            self._stalled.add(slot)
+            self.stalls += 1
+            self._report(phase, thread, now - deadline, dead)
+            self._restart(slot, phase, dead)
+
+    def _report(self, phase, thread, late, dead):
+        lines = [
+            f"watchdog: {phase.name} "
+            + ("died" if dead else f"stalled, {late:.1f}s past its deadline"),
+            f"  wakeups {phase.wakeups}",
+            f"  longest poll {phase.longest_poll * 1000:.1f} ms",
+        ]
+        frame = sys._current_frames().get(thread.ident)
+        if frame is not None:
+            lines.append("  stack (most recent call last):")
+            lines.extend(
+                "    " + line
+                for entry in traceback.format_stack(frame)
+                for line in entry.rstrip().splitlines()
+            )
+        print("\n".join(lines), file=sys.stderr, flush=True)
+
+    def _restart(self, slot, phase, dead):
+        restart_io = self._restart_io.get(phase.name)
+        if restart_io is not None:
+            try:
+                restart_io(phase)
+            except Exception:
+                traceback.print_exc()
+        if dead:
+            # A Thread cannot be started twice, but its loop can run on a new one
+            thread = Thread(target=phase.run, name=f"{phase.name}-restarted", daemon=True)
+            self._threads[slot] = (phase, thread)
+            thread.start()
+        if dead or restart_io is not None:
+            self.restarts += 1
+
+    def report(self):
+        """One-line summary of the watchdog's findings and cost."""
+        per_check = self.cpu_time / self.checks * 1e6 if self.checks else 0.0
+        return (
+            f"watchdog: {len(self._deadlines)} loops, {self.stalls} stalls, "
+            f"{self.restarts} restarts, {per_check:.0f} us CPU per check"
+        )
+
+
+def watchdog_from_environment(games, restart_io=None):
+    """
+    Start a watchdog over `games` if BOMB_WATCHDOG is set.
+
+    The variable's value is the grace period in seconds.
+
+    Returns:
+        Watchdog: The running watchdog, or None when it is off.
+    """
+    grace = os.environ.get("BOMB_WATCHDOG")
+    if not grace:
+        return None
+    watchdog = Watchdog(float(grace), restart_io=restart_io)
+    for game in games:
+        watchdog.watch(game)
+    watchdog.start()
+    return watchdog
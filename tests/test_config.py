@@ -0,0 +1,62 @@
+import json
+
+import pytest
+
+from bomb_core.config import DEFAULTS, ConfigFile, compile_config
+
+FIVE_CHOICES = ["A", "B", "C", "D", "E"]
+
+
+def test_defaults_compile():
+    config = compile_config({})
+    assert config.countdown == DEFAULTS["countdown"]
+    assert len(config.pins["wires"]) == 5
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"toggle_problems": 5},
+        {"toggle_problems": {"1 + 1": 2}},
+        {"toggle_problems": [["x", True]]},
+        {"toggle_problems": [["x", 2.0]]},
+        {"keypad_keys": 5},
+        {"keypad_keys": [[[1]]]},
+        {"keypad_keys": [[True]]},
+        {"keypad_keys": [[{"*": 1}]]},
+        {"wires_questions": 5},
+        {"wires_questions": [{"question": "q", "choices": 5, "correct": "A"}]},
+        {"wires_questions": [{"question": "q", "choices": "ABCDE", "correct": "A"}]},
+        {"wires_questions": [{"question": "q", "choices": [1, 2, 3, 4, 5], "correct": "A"}]},
+        {"wires_questions": [{"question": 7, "choices": FIVE_CHOICES, "correct": "A"}]},
+        {"wires_questions": [{"question": ["q"], "choices": FIVE_CHOICES, "correct": "A"}]},
+        {"pins": {"wires": "D14"}},
+        {"difficulty": {"max_operand": "255"}},
+        {"countdown": True},
+        [],
+    ],
+)
+def test_wrong_types_raise_value_error(data):
+    with pytest.raises(ValueError):
+        compile_config(data)
+
+
+def test_valid_custom_config():
+    config = compile_config(
+        {
+            "pins": {"wires": ["D14", "D15", "D18"]},
+            "toggle_problems": [["1 + 1", 2]],
+            "wires_questions": [{"question": "q", "choices": ["a", "b", "c"], "correct": "C"}],
+        }
+    )
+    assert config.toggle_problems == (("1 + 1", 2),)
+    assert config.wires_questions[0]["choices"] == ["a", "b", "c"]
+
+
+def test_reload_keeps_last_good_config_on_wrong_types(tmp_path, capsys):
+    path = tmp_path / "station.json"
+    path.write_text(json.dumps({"countdown": 200}))
+    config_file = ConfigFile(str(path))
+    path.write_text(json.dumps({"countdown": 240, "toggle_problems": 5}))
+    assert config_file.current().countdown == 200
+    assert config_file.error is not None